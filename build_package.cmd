@@ -43,6 +43,8 @@ echo Using "%SEVENZIP%" to pack
     -x!%~nx0 ^
     -xr!.git ^
     -xr!usage.gif ^
+    -xr!tests ^
+    -xr!tools ^
     -xr@.gitignore ^
     -x!.gitignore ^
     *
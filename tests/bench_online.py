@@ -0,0 +1,121 @@
+"""Benchmark of the online search under typing bursts, against local stand-ins for the providers
+
+Simulates users typing place names keystroke by keystroke, with typos they correct and searches they repeat. Inputs
+followed by the next keystroke within online_delay are superseded before the online search starts, the others go
+through Time._get_online_suggestions. Reports the latency of those calls, the requests the providers got and the hit
+rates of the caches.
+
+    python tests/bench_online.py --latency 0.3 --jitter 0.2 --error-rate 0.05 --gzip
+"""
+
+import argparse
+import json
+import random
+import string
+import time
+
+import plugin
+from fixture_server import PLACES, FixtureServer
+
+
+def typing_bursts(words, sessions, min_length, rand):
+    """Yields (input, seconds until the next keystroke) for every keystroke of the sessions"""
+    for _ in range(sessions):
+        word = rand.choice(words)
+        typed = ""
+        while typed != word:
+            if rand.random() < 0.05:
+                # a typo, noticed after a moment and deleted again
+                user_input = typed + rand.choice(string.ascii_lowercase)
+                pause = rand.uniform(0.3, 0.8)
+            else:
+                typed = user_input = word[: len(typed) + 1]
+                pause = rand.gauss(0.15, 0.05) if typed != word else rand.uniform(1, 3)
+            if len(user_input) >= min_length:
+                yield user_input, pause
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[int(round(fraction * (len(ordered) - 1)))] if ordered else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sessions", type=int, default=50, help="number of searches typed"
+    )
+    parser.add_argument(
+        "--providers",
+        type=int,
+        default=2,
+        help="number of stand-in servers asked in turn",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.1, help="seconds every response takes"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.05, help="seconds the latency varies by"
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="share of requests failing with status 500",
+    )
+    parser.add_argument("--gzip", action="store_true", help="compress responses")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rand = random.Random(args.seed)
+    servers = [
+        FixtureServer(
+            args.latency, args.jitter, args.error_rate, args.gzip, seed=args.seed + i
+        ).start()
+        for i in range(args.providers)
+    ]
+    urls = [server.url for server in servers]
+    time_plugin = plugin.start(
+        location_providers=urls, timezone_providers=urls, stats=True
+    )
+    with open(PLACES, encoding="utf-8") as places_file:
+        words = [place["name"].casefold() for place in json.load(places_file)]
+
+    latencies = []
+    superseded = 0
+    for user_input, pause in typing_bursts(
+        words, args.sessions, time_plugin._online_min_length, rand
+    ):
+        if pause < time_plugin._online_delay:
+            superseded += 1
+            continue
+        start = time.perf_counter()
+        time_plugin._get_online_suggestions(user_input)
+        latencies.append(time.perf_counter() - start)
+
+    print(
+        "online searches: {}, superseded by the next keystroke: {}".format(
+            len(latencies), superseded
+        )
+    )
+    print(
+        "latency ms: p50 {:.1f}, p95 {:.1f}, max {:.1f}".format(
+            percentile(latencies, 0.5) * 1000,
+            percentile(latencies, 0.95) * 1000,
+            max(latencies, default=0) * 1000,
+        )
+    )
+    for server in servers:
+        print("requests to {}: {}".format(server.url, dict(server.requests)))
+    for cache, hits, lookups in time_plugin._stats.hit_rates():
+        print(
+            "cache {}: {} of {} lookups hit ({:.0%})".format(
+                cache, hits, lookups, hits / lookups
+            )
+        )
+    for server in servers:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Local stand-in for the Nominatim search and the GeoTimezone API, answering from the places in
+fixtures/places.json with configurable latency, jitter, error rate and gzip compression
+"""
+
+import collections
+import gzip
+import http.server
+import json
+import os
+import random
+import threading
+import time
+import urllib.parse
+
+PLACES = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "fixtures", "places.json"
+)
+
+
+class FixtureServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, gzip=False, seed=None):
+        super().__init__(("127.0.0.1", 0), FixtureHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.gzip = gzip
+        self.random = random.Random(seed)
+        self.requests = collections.Counter()
+        with open(PLACES, encoding="utf-8") as places_file:
+            self.places = json.load(places_file)
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:{}".format(self.server_port)
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class FixtureHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        parts = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(parts.query))
+        server.requests[parts.path] += 1
+        time.sleep(
+            max(
+                server.latency + server.random.uniform(-server.jitter, server.jitter), 0
+            )
+        )
+
+        if server.random.random() < server.error_rate:
+            self.respond(500, {"error": "injected failure"})
+        elif parts.path == "/search":
+            q = query.get("q", "").casefold()
+            found = [
+                {key: place[key] for key in ("name", "display_name", "lat", "lon")}
+                for place in server.places
+                if q in place["name"].casefold()
+            ]
+            self.respond(200, found[: int(query.get("limit", 10))])
+        elif parts.path == "/public/timezone":
+            timezone = None
+            for place in server.places:
+                if (place["lat"], place["lon"]) == (
+                    query.get("latitude"),
+                    query.get("longitude"),
+                ):
+                    timezone = place["timezone"]
+            self.respond(
+                200,
+                {
+                    "latitude": query.get("latitude"),
+                    "longitude": query.get("longitude"),
+                    "iana_timezone": timezone,
+                },
+            )
+        else:
+            self.respond(404, {"error": "not found"})
+
+    def respond(self, status, content):
+        body = json.dumps(content).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if self.server.gzip and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
@@ -0,0 +1,31 @@
+"""Loads time.py with the stand-in launcher modules, so it can be tested outside of Keypirinha"""
+
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "tests", "stubs"))
+
+import keypirinha  # noqa: E402
+
+
+def load():
+    """Returns the plugin module, which is named time_plugin to not shadow the standard time module"""
+    if "time_plugin" not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            "time_plugin", os.path.join(ROOT, "time.py")
+        )
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["time_plugin"] = module
+        spec.loader.exec_module(module)
+    return sys.modules["time_plugin"]
+
+
+def start(**settings):
+    """Returns a started plugin instance using the settings, without the background warm-up"""
+    keypirinha.SETTINGS.clear()
+    keypirinha.SETTINGS.update({"warmup": False, **settings})
+    plugin = load().Time()
+    plugin.on_start()
+    return plugin
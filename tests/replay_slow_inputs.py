@@ -0,0 +1,95 @@
+"""Replays the records of the slow input log and reports the durations of the phases of on_suggest
+
+Rebuilds the items_chain of every record as catalog items from the recorded labels, targets and data bags, runs
+on_suggest with it a number of times and prints the recorded durations next to the replayed ones: those of the first
+run, which fills the caches, and the median of all runs. The online search is off unless --online is given, so
+replaying doesn't depend on the providers.
+
+    python tests/replay_slow_inputs.py --repeat 5 slow_inputs.jsonl
+"""
+
+import argparse
+import json
+import statistics
+
+import plugin
+
+import keypirinha  # after plugin, which puts the stand-in launcher modules on sys.path
+
+
+def read_records(path):
+    """Returns the records of the slow input log, skipping lines that aren't valid records"""
+    records = []
+    with open(path, encoding="utf-8") as log:
+        for line in log:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and "items_chain" in record:
+                records.append(record)
+    return records
+
+
+def rebuild_chain(record):
+    """Returns the items_chain of the record as catalog items"""
+    return [
+        keypirinha.CatalogItem(
+            label=item["label"], target=item["target"], data_bag=item["data_bag"]
+        )
+        for item in record["items_chain"]
+    ]
+
+
+def replay(time_plugin, record, repeat):
+    """Runs on_suggest with the input and items_chain of the record and returns the durations of every phase in
+    milliseconds, one per run"""
+    items_chain = rebuild_chain(record)
+    phases = {}
+    for _ in range(repeat):
+        time_plugin.on_suggest(record["user_input"], items_chain)
+        for name, elapsed in time_plugin._stats.current.items():
+            phases.setdefault(name, []).append(elapsed * 1000)
+    return phases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("log", help="path of slow_inputs.jsonl")
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="number of runs of every record"
+    )
+    parser.add_argument(
+        "--online", action="store_true", help="ask the online providers"
+    )
+    args = parser.parse_args()
+
+    time_plugin = plugin.start(online=args.online, stats=True)
+    for record in read_records(args.log):
+        print(
+            "{} {!r} after {}".format(
+                record.get("time", "?"),
+                record["user_input"],
+                " > ".join(item["label"] for item in record["items_chain"]),
+            )
+        )
+        recorded = record.get("phases_ms", {})
+        replayed = replay(time_plugin, record, args.repeat)
+        for name in sorted(set(recorded) | set(replayed)):
+            print(
+                "  {}: recorded {}, replayed first {}, median {} in {} runs".format(
+                    name,
+                    "{:.3f} ms".format(recorded[name]) if name in recorded else "-",
+                    "{:.3f} ms".format(replayed[name][0]) if name in replayed else "-",
+                    (
+                        "{:.3f} ms".format(statistics.median(replayed[name]))
+                        if name in replayed
+                        else "-"
+                    ),
+                    len(replayed.get(name, ())),
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
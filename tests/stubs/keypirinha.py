@@ -0,0 +1,79 @@
+"""Stand-in for the launcher's keypirinha module, just enough to run the plugin outside of Keypirinha"""
+
+import tempfile
+import types
+
+ItemCategory = types.SimpleNamespace(KEYWORD=1)
+ItemArgsHint = types.SimpleNamespace(FORBIDDEN=0, ACCEPTED=1, REQUIRED=2)
+ItemHitHint = types.SimpleNamespace(KEEPALL=0, IGNORE=1)
+Match = types.SimpleNamespace(DEFAULT=0, ANY=1)
+Sort = types.SimpleNamespace(DEFAULT=0, NONE=1)
+Events = types.SimpleNamespace(PACKCONFIG=1, NETOPTIONS=2)
+SETTINGS = {}
+
+
+def name():
+    return "Keypirinha"
+
+
+def version_string():
+    return "2.26"
+
+
+class CatalogItem:
+    def __init__(self, **kwargs):
+        self.args = kwargs
+
+    def label(self):
+        return self.args["label"]
+
+    def target(self):
+        return self.args["target"]
+
+    def data_bag(self):
+        return self.args.get("data_bag")
+
+
+class Settings:
+    def _get(self, key, section=None, fallback=None, *args, **kwargs):
+        return SETTINGS.get(key, fallback)
+
+    get = get_bool = get_int = get_float = get_multiline = _get
+
+
+class Plugin:
+    def __init__(self):
+        self.suggestions = None
+        self.terminate = False
+
+    def dbg(self, *args):
+        pass
+
+    info = warn = err = dbg
+
+    def load_settings(self):
+        return Settings()
+
+    def create_item(self, **kwargs):
+        return CatalogItem(**kwargs)
+
+    def set_suggestions(self, suggestions, match=Match.DEFAULT, sort=Sort.DEFAULT):
+        self.suggestions = list(suggestions)
+
+    def should_terminate(self, wait=None):
+        return self.terminate
+
+    def get_package_cache_path(self, create=False):
+        return tempfile.gettempdir()
+
+    def package_full_name(self):
+        return "Time"
+
+    def load_icon(self, source):
+        return None
+
+    def set_default_icon(self, icon):
+        pass
+
+    def set_catalog(self, catalog):
+        pass
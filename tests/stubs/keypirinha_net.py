@@ -0,0 +1,7 @@
+"""Stand-in for the launcher's keypirinha_net module"""
+
+import urllib.request
+
+
+def build_urllib_opener(proxies=None, ssl_check_hostname=None, extra_handlers=[]):
+    return urllib.request.build_opener()
@@ -0,0 +1,7 @@
+"""Stand-in for the launcher's keypirinha_util module"""
+
+clipboard = []
+
+
+def set_clipboard(text):
+    clipboard.append(text)
@@ -0,0 +1,44 @@
+"""Tests of CircuitBreaker"""
+
+import time
+import unittest
+
+import plugin
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def setUp(self):
+        self.breaker = plugin.load().CircuitBreaker(max_failures=2, cooldown=0.2)
+        self.breaker.failure()
+        self.breaker.failure()
+
+    def test_opens_after_failures_in_row(self):
+        self.assertEqual(self.breaker.state(), "open")
+        self.assertFalse(self.breaker.allow())
+
+    def test_allows_a_single_trial_when_half_open(self):
+        time.sleep(0.25)
+        self.assertEqual(self.breaker.state(), "half-open")
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+        self.breaker.success()
+        self.assertEqual(self.breaker.state(), "closed")
+        self.assertTrue(self.breaker.allow())
+        self.assertTrue(self.breaker.allow())
+
+    def test_failed_trial_opens_again(self):
+        time.sleep(0.25)
+        self.assertTrue(self.breaker.allow())
+        self.breaker.failure()
+        self.assertEqual(self.breaker.state(), "open")
+        self.assertFalse(self.breaker.allow())
+
+    def test_another_trial_if_the_first_never_reports_back(self):
+        time.sleep(0.25)
+        self.assertTrue(self.breaker.allow())
+        time.sleep(0.25)
+        self.assertTrue(self.breaker.allow())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+"""Tests of the log conversion tool"""
+
+import datetime
+import sys
+import unittest
+
+import plugin
+
+sys.path.insert(0, plugin.ROOT)
+
+from tools import convert  # noqa: E402
+
+
+class ConvertTest(unittest.TestCase):
+    def setUp(self):
+        self.plugin = plugin.start(online=False)
+        self.tokyo = self.plugin._gettz("Asia/Tokyo")
+
+    def test_timestamps_are_replaced(self):
+        line = "a 2024-03-10T14:22:05Z b 2024-03-10 16:22:05,123+0200 c\n"
+        self.assertEqual(
+            convert.convert_line(self.plugin, line, self.tokyo, None),
+            ("a 2024-03-10T23:22:05+09:00 b 2024-03-10T23:22:05.123000+09:00 c\n", 2),
+        )
+
+    def test_format(self):
+        expected = (
+            datetime.datetime.fromtimestamp(1710080525)
+            .astimezone(self.tokyo)
+            .strftime("%H:%M")
+        )
+        self.assertEqual(
+            convert.convert_line(self.plugin, "took 1710080525 s", self.tokyo, "%H:%M"),
+            ("took {} s".format(expected), 1),
+        )
+
+    def test_lines_without_timestamps_are_unchanged(self):
+        self.assertEqual(
+            convert.convert_line(self.plugin, "id 171008052512345678\n", None, None),
+            ("id 171008052512345678\n", 0),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
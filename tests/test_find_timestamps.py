@@ -0,0 +1,64 @@
+"""Tests of the search for timestamps in longer texts, like pasted log lines"""
+
+import datetime
+import unittest
+
+import plugin
+
+import keypirinha  # after plugin, which puts the stand-in launcher modules on sys.path
+
+LINE = (
+    "2024-03-10T14:22:05Z worker started, job 2024-03-10 16:22:05,123+0200 took 1710080525 s, "
+    "retry at 1710080525123, trace id 171008052512345678"
+)
+
+
+class FindTimestampsTest(unittest.TestCase):
+    def setUp(self):
+        self.plugin = plugin.start(online=False)
+
+    def test_spans_and_datetimes(self):
+        utc = datetime.timezone.utc
+        expected = [
+            (
+                "2024-03-10T14:22:05Z",
+                datetime.datetime(2024, 3, 10, 14, 22, 5, tzinfo=utc),
+            ),
+            (
+                "2024-03-10 16:22:05,123+0200",
+                datetime.datetime(
+                    2024,
+                    3,
+                    10,
+                    16,
+                    22,
+                    5,
+                    123000,
+                    tzinfo=datetime.timezone(datetime.timedelta(hours=2)),
+                ),
+            ),
+            ("1710080525", datetime.datetime.fromtimestamp(1710080525)),
+            ("1710080525123", datetime.datetime.fromtimestamp(1710080525.123)),
+        ]
+        found = self.plugin._find_timestamps(LINE)
+        self.assertEqual(
+            [LINE[start:end] for (start, end), _ in found],
+            [text for text, _ in expected],
+        )
+        for (_, parsed), (text, value) in zip(found, expected):
+            with self.subTest(text=text):
+                self.assertEqual(parsed, value)
+                self.assertEqual(parsed.utcoffset(), value.utcoffset())
+
+    def test_one_suggestion_per_timestamp(self):
+        self.plugin.on_suggest(
+            LINE, [keypirinha.CatalogItem(target="time", label="Time")]
+        )
+        self.assertEqual(
+            [suggestion.target() for suggestion in self.plugin.suggestions],
+            ["found_0", "found_1", "found_2", "found_3"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
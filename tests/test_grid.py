@@ -0,0 +1,84 @@
+"""Tests of answering timezone lookups from grid cells"""
+
+import time
+import unittest
+
+import plugin
+
+
+class Provider:
+    """Timezone provider answering from a dict of locations, counting its requests"""
+
+    name = "grid"
+
+    def __init__(self, zones):
+        self.zones = zones
+        self.requests = []
+
+    def timezone(self, fetch_json, lat, lon, timeout):
+        self.requests.append((lat, lon))
+        return self.zones[(lat, lon)]
+
+
+class GridTest(unittest.TestCase):
+    def setUp(self):
+        self.plugin = plugin.start(timezone_providers=[])
+
+    def lookup(self, provider, lat, lon):
+        self.plugin._timezone_providers = [provider]
+        return self.plugin._lookup_timezone(lat, lon, time.monotonic() + 1)
+
+    def wait_for_check(self, provider, requests):
+        """Waits until the provider got the number of requests and the background check is done"""
+        deadline = time.monotonic() + 1
+        while (
+            len(provider.requests) < requests or self.plugin._grid_checks
+        ) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(provider.requests), requests)
+
+    def test_cell_is_answered_after_the_first_hit_and_confirmed(self):
+        provider = Provider(
+            {
+                ("52.520", "13.400"): "Europe/Berlin",
+                ("52.521", "13.401"): "Europe/Berlin",
+                ("52.522", "13.402"): "Europe/Berlin",
+            }
+        )
+        self.assertEqual(self.lookup(provider, "52.520", "13.400"), "Europe/Berlin")
+        self.assertEqual(len(provider.requests), 1)
+
+        # answered from the cell, the exact location is checked in the background
+        self.assertEqual(self.lookup(provider, "52.521", "13.401"), "Europe/Berlin")
+        self.wait_for_check(provider, 2)
+        self.assertEqual(provider.requests[-1], ("52.521", "13.401"))
+        self.assertEqual(self.plugin._grid_cache[(52.52, 13.4)][1], 2)
+
+        # confirmed, no more requests
+        self.assertEqual(self.lookup(provider, "52.522", "13.402"), "Europe/Berlin")
+        time.sleep(0.1)
+        self.assertEqual(len(provider.requests), 2)
+
+    def test_disagreeing_location_makes_a_border_cell(self):
+        provider = Provider(
+            {
+                ("47.560", "7.590"): "Europe/Zurich",
+                ("47.561", "7.591"): "Europe/Berlin",
+                ("47.562", "7.592"): "Europe/Paris",
+            }
+        )
+        self.assertEqual(self.lookup(provider, "47.560", "7.590"), "Europe/Zurich")
+        # the cell's answer is given first, the background check finds the border
+        self.assertEqual(self.lookup(provider, "47.561", "7.591"), "Europe/Zurich")
+        self.wait_for_check(provider, 2)
+        self.assertIsNone(self.plugin._grid_cache[(47.56, 7.59)])
+
+        # the checked location now gets its exact answer, border cells are always requested
+        self.assertEqual(self.lookup(provider, "47.561", "7.591"), "Europe/Berlin")
+        self.assertEqual(self.lookup(provider, "47.562", "7.592"), "Europe/Paris")
+        self.assertEqual(provider.requests[-1], ("47.562", "7.592"))
+        self.assertEqual(len(provider.requests), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
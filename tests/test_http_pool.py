@@ -0,0 +1,98 @@
+"""Tests of HttpPool against a local stand-in HTTPS server"""
+
+import http.server
+import os
+import ssl
+import threading
+import time
+import unittest
+import urllib.error
+
+import plugin
+
+CERT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "localhost.pem")
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        if self.path == "/slow":
+            time.sleep(1)
+        status = 500 if self.path == "/error" else 200
+        body = b'{"path": "' + self.path.encode() + b'"}'
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        # drops the kept connection without telling the client, like a server after its idle timeout
+        self.close_connection = self.path == "/drop"
+
+    def log_message(self, format, *args):
+        pass
+
+
+class HttpPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(("localhost", 0), Handler)
+        self.server.connections = 0
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        context.load_cert_chain(CERT)
+        self.server.socket = context.wrap_socket(self.server.socket, server_side=True)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.pool = plugin.load().HttpPool([("User-Agent", "test")], max_per_host=1)
+        self.pool._ssl_context = ssl.create_default_context(cafile=CERT)
+        self.url = "https://localhost:{}".format(self.server.server_port)
+
+    def tearDown(self):
+        self.pool.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def get(self, path, timeout=5):
+        with self.pool.open(self.url + path, timeout) as resp:
+            return resp.read()
+
+    def test_connection_is_kept_alive(self):
+        for i in range(3):
+            self.assertEqual(
+                self.get("/search?q={}".format(i)), b'{"path": "/search?q=%d"}' % i
+            )
+        self.assertEqual(self.server.connections, 1)
+
+    def test_closed_connection_is_reopened(self):
+        self.get("/drop")
+        time.sleep(0.1)
+        self.assertEqual(self.get("/again"), b'{"path": "/again"}')
+        self.assertEqual(self.server.connections, 2)
+
+    def test_error_status_raises(self):
+        with self.assertRaises(urllib.error.HTTPError):
+            self.get("/error")
+        self.assertEqual(self.get("/fine"), b'{"path": "/fine"}')
+
+    def test_timeout_of_kept_connection_is_not_retried(self):
+        self.get("/fast")
+        start = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            self.get("/slow", timeout=0.3)
+        self.assertLess(time.monotonic() - start, 0.55)
+
+    def test_waiting_for_a_free_connection_is_bounded(self):
+        busy = threading.Thread(target=self.get, args=("/slow",))
+        busy.start()
+        time.sleep(0.2)
+        start = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            self.get("/fast", timeout=0.3)
+        self.assertLess(time.monotonic() - start, 0.55)
+        busy.join()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""Import-time budget of the plugin module, measured with python -X importtime like Keypirinha loads it
+
+Run it as a script to see what the plugin imports and how long each import takes.
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+TESTS = os.path.dirname(os.path.abspath(__file__))
+MARKER = "-- loading time.py --"
+
+# about twice what loading the plugin takes, importing pstats or dateutil's parser on top of that exceeds it
+BUDGET_US = 25000
+
+# modules that must only be imported on first use, not when the launcher loads the plugin
+DEFERRED = [
+    "dateutil.parser",
+    "dateutil.zoneinfo",
+    "dateutil.tz",
+    "concurrent.futures",
+    "cProfile",
+    "pstats",
+    "tarfile",
+    "six",
+]
+
+SCRIPT = """
+import sys
+sys.path.insert(0, {tests!r})
+import plugin
+# the launcher has loaded its own modules before any plugin
+import keypirinha, keypirinha_net, keypirinha_util
+sys.stderr.write({marker!r} + "\\n")
+sys.stderr.flush()
+plugin.load()
+"""
+
+
+def measure():
+    """Returns the (module, self us, cumulative us) imports that loading time.py causes, top-level ones have no
+    leading spaces in their name"""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            SCRIPT.format(tests=TESTS, marker=MARKER),
+        ],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    lines = result.stderr.splitlines()
+    imports = []
+    for line in lines[lines.index(MARKER) + 1 :]:
+        if not line.startswith("import time:"):
+            continue
+        own, cumulative, module = line[len("import time:") :].split("|")
+        if own.strip().isdigit():
+            imports.append((module.rstrip(), int(own), int(cumulative)))
+    return imports
+
+
+def total(imports):
+    """Returns the time in us all imports took together"""
+    return sum(
+        cumulative for module, own, cumulative in imports if not module.startswith("  ")
+    )
+
+
+class ImportTimeTest(unittest.TestCase):
+    def test_heavy_modules_are_deferred(self):
+        imported = {module.strip() for module, own, cumulative in measure()}
+        self.assertFalse(imported.intersection(DEFERRED))
+
+    def test_import_time_budget(self):
+        # the best of a few runs, so a busy machine doesn't fail the test
+        best = min(total(measure()) for _ in range(3))
+        self.assertLess(best, BUDGET_US)
+
+
+if __name__ == "__main__":
+    imports = measure()
+    for module, own, cumulative in imports:
+        print("{:>10} {:>10}  {}".format(own, cumulative, module))
+    print("total: {} us, budget: {} us".format(total(imports), BUDGET_US))
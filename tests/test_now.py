@@ -0,0 +1,55 @@
+"""Tests of the suggestions for the current time, rendered ahead while the launcher is shown"""
+
+import time
+import unittest
+
+import plugin
+
+import keypirinha  # after plugin, which puts the stand-in launcher modules on sys.path
+
+
+def item(target):
+    return keypirinha.CatalogItem(target=target, label=target)
+
+
+class NowTest(unittest.TestCase):
+    def setUp(self):
+        self.plugin = plugin.start(online=False, stats=True)
+
+    def tearDown(self):
+        self.plugin.on_deactivated()
+        self.plugin._now_thread.join(2)
+
+    def now_hits(self):
+        rates = {
+            cache: (hits, lookups)
+            for cache, hits, lookups in self.plugin._stats.hit_rates()
+        }
+        return rates.get("now", (0, 0))
+
+    def test_opening_time_finds_the_suggestions_ready(self):
+        self.plugin.on_activated()
+        time.sleep(0.2)
+        self.plugin.on_suggest("", [item("time")])
+        self.assertEqual(self.now_hits(), (1, 1))
+        self.assertTrue(self.plugin.suggestions)
+
+    def test_recently_used_timezones_are_rendered_ahead(self):
+        self.plugin.on_activated()
+        self.plugin.on_suggest("", [item("timezone"), item("Asia/Tokyo")])
+        time.sleep(1.2)
+        self.plugin.on_suggest("", [item("timezone"), item("Asia/Tokyo")])
+        hits, lookups = self.now_hits()
+        self.assertEqual(lookups, 2)
+        self.assertGreaterEqual(hits, 1)
+        self.assertTrue(self.plugin.suggestions[0].label().isdigit())
+
+    def test_stops_when_the_launcher_is_hidden(self):
+        self.plugin.on_activated()
+        self.plugin.on_deactivated()
+        self.plugin._now_thread.join(2)
+        self.assertFalse(self.plugin._now_thread.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()
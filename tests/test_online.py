@@ -0,0 +1,75 @@
+"""Tests of the online search against local stand-ins for the providers"""
+
+import time
+import unittest
+
+import plugin
+from fixture_server import FixtureServer
+
+
+class OnlineTest(unittest.TestCase):
+    def setUp(self):
+        self.servers = []
+
+    def tearDown(self):
+        for server in self.servers:
+            server.stop()
+
+    def start(self, *servers, **settings):
+        self.servers.extend(server.start() for server in servers)
+        urls = [server.url for server in servers]
+        settings.setdefault("location_providers", urls)
+        settings.setdefault("timezone_providers", urls)
+        return plugin.start(**settings)
+
+    def targets(self, suggestions):
+        return [suggestion.target() for suggestion in suggestions]
+
+    def test_gzip_responses(self):
+        time_plugin = self.start(FixtureServer(gzip=True))
+        self.assertEqual(
+            self.targets(time_plugin._get_online_suggestions("berlin")),
+            ["Europe/Berlin"],
+        )
+
+    def test_failing_provider_is_skipped(self):
+        time_plugin = self.start(FixtureServer(error_rate=1), FixtureServer())
+        self.assertEqual(
+            self.targets(time_plugin._get_online_suggestions("kathmandu")),
+            ["Asia/Kathmandu"],
+        )
+
+    def test_slow_provider_is_hedged(self):
+        slow, fast = FixtureServer(latency=2), FixtureServer()
+        time_plugin = self.start(slow, fast, timezone_providers=[fast.url])
+        start = time.monotonic()
+        self.assertEqual(
+            self.targets(time_plugin._get_online_suggestions("tokyo")), ["Asia/Tokyo"]
+        )
+        self.assertLess(time.monotonic() - start, 1.8)
+        self.assertEqual(fast.requests["/search"], 1)
+
+    def test_results_are_cached(self):
+        server = FixtureServer()
+        time_plugin = self.start(server)
+        for _ in range(3):
+            self.assertEqual(len(time_plugin._get_online_suggestions("ber")), 3)
+        self.assertEqual(server.requests["/search"], 1)
+        self.assertEqual(server.requests["/public/timezone"], 3)
+
+    def test_search_is_bounded_when_all_providers_fail(self):
+        time_plugin = self.start(FixtureServer(latency=5), online_timeout=0.5)
+        start = time.monotonic()
+        self.assertEqual(time_plugin._get_online_suggestions("paris"), [])
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_request_phases_are_traced(self):
+        time_plugin = self.start(FixtureServer(), trace=True)
+        time_plugin._get_online_suggestions("berlin")
+        names = [event["name"] for event in time_plugin._tracer._events]
+        for name in ("queue", "slot", "connect", "response", "read"):
+            self.assertIn(name, names)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+"""Tests of replaying the slow input log"""
+
+import os
+import tempfile
+import unittest
+
+import plugin
+import replay_slow_inputs
+
+import keypirinha  # after plugin, which puts the stand-in launcher modules on sys.path
+
+
+class ReplaySlowInputsTest(unittest.TestCase):
+    def setUp(self):
+        self.plugin = plugin.start(online=False, stats=True)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.plugin.get_package_cache_path = lambda create=False: directory.name
+        self.log = os.path.join(directory.name, self.plugin.SLOW_INPUT_LOG)
+
+    def test_logged_records_are_replayed(self):
+        self.plugin.on_suggest(
+            "2024-03-10T14:22:05.123456+00:00",
+            [keypirinha.CatalogItem(target="time", label="Time")],
+        )
+        previous = self.plugin.suggestions[0]
+        chain = [
+            keypirinha.CatalogItem(target="time", label="Time"),
+            previous,
+            keypirinha.CatalogItem(target="Asia/Tokyo", label="Asia/Tokyo"),
+        ]
+        self.plugin._log_slow_input("", chain, {"on_suggest": 0.25})
+        with open(self.log, "a", encoding="utf-8") as log:
+            log.write("not json\n")
+
+        records = replay_slow_inputs.read_records(self.log)
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["phases_ms"], {"on_suggest": 250})
+        rebuilt = replay_slow_inputs.rebuild_chain(records[0])
+        self.assertEqual(
+            [(item.label(), item.target(), item.data_bag()) for item in rebuilt],
+            [(item.label(), item.target(), item.data_bag()) for item in chain],
+        )
+
+        phases = replay_slow_inputs.replay(self.plugin, records[0], 3)
+        self.assertEqual(len(phases["on_suggest"]), 3)
+        self.assertIn(
+            "2024-03-10T23:22:05.123456+09:00",
+            [s.label() for s in self.plugin.suggestions],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+"""Tests of on_suggest with items_chains as Keypirinha passes them"""
+
+import unittest
+
+import plugin
+
+import keypirinha  # after plugin, which puts the stand-in launcher modules on sys.path
+
+
+def item(target, label=None, data_bag=None):
+    return keypirinha.CatalogItem(
+        target=target, label=label or target, data_bag=data_bag
+    )
+
+
+class SuggestTest(unittest.TestCase):
+    def setUp(self):
+        self.plugin = plugin.start(online=False)
+
+    def test_unknown_timezone_falls_back_to_local_time(self):
+        chain = [item("time"), item("x"), item("Mars/Olympus_Mons")]
+        self.plugin.on_suggest("2024-03-10 14:22", chain)
+        self.assertTrue(self.plugin.suggestions)
+
+        self.plugin.on_suggest("2024-03-10 14:22 log line", chain)
+        self.assertTrue(self.plugin.suggestions)
+
+    def test_previous_time_without_data_bag_is_parsed_from_its_label(self):
+        for data_bag in (None, "", "not a number|Europe/Berlin"):
+            with self.subTest(data_bag=data_bag):
+                chain = [
+                    item("time"),
+                    item("format_0_", "2024-03-10T14:22:00+00:00", data_bag),
+                    item("Asia/Tokyo"),
+                ]
+                self.plugin.on_suggest("", chain)
+                self.assertIn(
+                    "2024-03-10T23:22:00+09:00",
+                    [s.label() for s in self.plugin.suggestions],
+                )
+
+    def test_exact_time_survives_a_date_only_format(self):
+        self.plugin.on_suggest("2024-03-10T14:22:05.123456+00:00", [item("time")])
+        date_only = [s for s in self.plugin.suggestions if s.label() == "03/10/24"]
+        self.assertTrue(date_only)
+        self.assertTrue(date_only[0].data_bag())
+
+        self.plugin.on_suggest("", [item("time"), date_only[0], item("Asia/Tokyo")])
+        self.assertIn(
+            "2024-03-10T23:22:05.123456+09:00",
+            [s.label() for s in self.plugin.suggestions],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+"""Tests of writing the trace file"""
+
+import os
+import tempfile
+import unittest
+
+import plugin
+
+import keypirinha  # after plugin, which puts the stand-in launcher modules on sys.path
+import keypirinha_util
+
+
+class TraceTest(unittest.TestCase):
+    def setUp(self):
+        self.plugin = plugin.start(online=False, trace=True)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.plugin.get_package_cache_path = lambda create=False: self.directory
+        del keypirinha_util.clipboard[:]
+
+    def write(self):
+        self.plugin.on_suggest(
+            "2024-03-10 14:22", [keypirinha.CatalogItem(target="time", label="Time")]
+        )
+        self.plugin.on_execute(
+            keypirinha.CatalogItem(target="trace_write", label="Write trace file"), ""
+        )
+
+    def test_path_is_copied(self):
+        self.write()
+        self.assertEqual(len(keypirinha_util.clipboard), 1)
+        self.assertTrue(os.path.isfile(keypirinha_util.clipboard[0]))
+
+    def test_failed_write_is_not_copied(self):
+        self.directory = os.path.join(self.directory, "missing")
+        self.write()
+        self.assertEqual(keypirinha_util.clipboard, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""Differential test of the datetime.fromisoformat fast path in Time._tryparse against dateutil.parser.parse"""
+
+import itertools
+import random
+import unittest
+
+import plugin
+
+
+def iso_strings():
+    """Yields strings in every shape ISO_EXTENDED_RE accepts, including some invalid dates and times"""
+    rand = random.Random(8601)
+    dates = ["2024-03-10", "1999-12-31", "2000-02-29", "2023-02-29", "2024-13-01"]
+    dates += [
+        "{:04}-{:02}-{:02}".format(
+            rand.randint(1, 9999), rand.randint(1, 12), rand.randint(1, 28)
+        )
+        for _ in range(20)
+    ]
+    times = [
+        "",
+        "{h}",
+        "{h}:{m}",
+        "{h}:{m}:{s}",
+        "{h}:{m}:{s}.{ms}",
+        "{h}:{m}:{s}.{us}",
+    ]
+    offsets = ["", "Z", "+00:00", "+05:30", "-03:00", "+14:00", "-09:30"]
+    for date, time, separator, offset in itertools.product(dates, times, "T ", offsets):
+        if not time:
+            yield date
+            continue
+        for _ in range(3):
+            yield date + separator + time.format(
+                h="{:02}".format(rand.choice([0, 12, 23, rand.randint(0, 24)])),
+                m="{:02}".format(rand.randint(0, 59)),
+                s="{:02}".format(rand.choice([0, 59, rand.randint(0, 60)])),
+                ms="{:03}".format(rand.randint(0, 999)),
+                us="{:06}".format(rand.randint(0, 999999)),
+            ) + offset
+
+
+class TryParseTest(unittest.TestCase):
+    def setUp(self):
+        self.module = plugin.load()
+        self.plugin = plugin.start()
+
+    def test_fast_path_agrees_with_dateutil(self):
+        for text in iso_strings():
+            with self.subTest(text=text):
+                self.assertTrue(self.module.ISO_EXTENDED_RE.match(text))
+                try:
+                    expected = self.module.dateutil.parser.parse(text)
+                except (ValueError, OverflowError):
+                    expected = None
+                parsed = self.plugin._tryparse(text)
+                self.assertEqual(parsed, expected)
+                if expected is not None:
+                    self.assertEqual(parsed.utcoffset(), expected.utcoffset())
+
+
+if __name__ == "__main__":
+    unittest.main()
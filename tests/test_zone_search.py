@@ -0,0 +1,50 @@
+"""Tests of the search in the timezone list"""
+
+import unittest
+
+import plugin
+
+import keypirinha  # after plugin, which puts the stand-in launcher modules on sys.path
+
+
+class ZoneSearchTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.plugin = plugin.start(online=False)
+
+    def search(self, user_input):
+        self.plugin.on_suggest(
+            user_input, [keypirinha.CatalogItem(target="timezone", label="Timezone")]
+        )
+        return [suggestion.target() for suggestion in self.plugin.suggestions]
+
+    def test_name_ranks_first(self):
+        for user_input, zone in [
+            ("UTC", "UTC"),
+            ("zulu", "Zulu"),
+            ("berlin", "Europe/Berlin"),
+            ("new york", "America/New_York"),
+            ("kolk", "Asia/Kolkata"),
+        ]:
+            with self.subTest(user_input=user_input):
+                self.assertEqual(self.search(user_input)[0], zone)
+
+    def test_aliases_and_abbreviations(self):
+        self.assertEqual(self.search("NYC"), ["America/New_York"])
+        self.assertEqual(self.search("Germany"), ["Europe/Berlin"])
+        self.assertIn("America/New_York", self.search("EST"))
+
+    def test_offsets(self):
+        self.assertIn("Asia/Kolkata", self.search("+05:30"))
+        self.assertIn("Asia/Kolkata", self.search("UTC+0530"))
+        self.assertCountEqual(
+            self.search("utc +5:45"), ["Asia/Kathmandu", "Asia/Katmandu"]
+        )
+        self.assertIn("Asia/Tokyo", self.search("GMT+9"))
+
+    def test_no_match_shows_all_zones(self):
+        self.assertGreater(len(self.search("xyzzy")), 500)
+
+
+if __name__ == "__main__":
+    unittest.main()
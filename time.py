@@ -1,21 +1,526 @@
 import keypirinha as kp
 import keypirinha_net as kpn
 import keypirinha_util as kpu
+import base64
+import bisect
+import collections
 import contextlib
 import datetime
+import http.client
 import json
 import locale
 import os
 import re
 import site
+import ssl
 import sys
+import threading
+import time
 import traceback
 import urllib
+import zlib
 
 # insert lib directory to path to import modules normally
 site.addsitedir(os.path.join(os.path.dirname(__file__), "lib"))
-import dateutil.parser
-import dateutil.zoneinfo
+# only the package, its submodules (parser, tz, zoneinfo) are imported lazily on first attribute access
+import dateutil
+
+# ISO 8601 strings in extended format that datetime.fromisoformat understands on every supported python version
+ISO_EXTENDED_RE = re.compile(
+    r"^\d{4}-\d{2}-\d{2}"
+    r"(?:[T ]\d{2}(?::\d{2}(?::\d{2}(?:\.(?:\d{6}|\d{3}))?)?)?(?:Z|[+-]\d{2}:\d{2})?)?$"
+)
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+# Parts of arbitrary text (log lines, stack traces, ...) that look like a date or a timestamp
+TIMESTAMP_SCAN_RE = re.compile(
+    r"(?<![\d.])(?:"
+    r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:[.,]\d+)?)?(?: ?(?:Z|[+-]\d{2}:?\d{2}))?)?"
+    r"|\d{10}(?:\d{3})?(?:\.\d+)?"
+    r")(?![\d.])"
+)
+
+# Words of timezone names, aliases and search inputs, offsets like +0530 are kept in one piece
+ZONE_TOKEN_RE = re.compile(r"[+-]\d+|[^\W_]+")
+
+# UTC offsets like +05:30, +0530, UTC-3 or GMT+9 (meant as UTC+9, not with the inverted sign of the Etc/GMT+9 zone)
+ZONE_OFFSET_RE = re.compile(
+    r"^(?:utc|gmt)?\s*([+-])\s*(\d{1,2})(?::?(\d{2}))?$", re.IGNORECASE
+)
+
+# Additional search words for timezones, common nicknames, countries and Windows timezone names, which are not part of
+# the timezone database
+ZONE_ALIASES = {
+    "America/New_York": ("NYC", "New York City", "Eastern", "Eastern Standard Time"),
+    "America/Chicago": ("Central", "Central Standard Time"),
+    "America/Denver": ("Mountain", "Mountain Standard Time"),
+    "America/Phoenix": ("Arizona", "US Mountain Standard Time"),
+    "America/Los_Angeles": (
+        "LA",
+        "SF",
+        "San Francisco",
+        "Pacific",
+        "Pacific Standard Time",
+    ),
+    "America/Anchorage": ("Alaska", "Alaskan Standard Time"),
+    "Pacific/Honolulu": ("Hawaii", "Hawaiian Standard Time"),
+    "America/Toronto": ("Canada",),
+    "America/Mexico_City": ("Mexico", "Central Standard Time (Mexico)"),
+    "America/Sao_Paulo": ("Brazil", "E. South America Standard Time"),
+    "America/Argentina/Buenos_Aires": ("Argentina", "Argentina Standard Time"),
+    "Europe/London": ("UK", "Britain", "England", "GMT Standard Time"),
+    "Europe/Dublin": ("Ireland",),
+    "Europe/Berlin": ("Germany", "W. Europe Standard Time"),
+    "Europe/Paris": ("France", "Romance Standard Time"),
+    "Europe/Madrid": ("Spain",),
+    "Europe/Rome": ("Italy",),
+    "Europe/Amsterdam": ("Netherlands", "Holland"),
+    "Europe/Zurich": ("Switzerland",),
+    "Europe/Warsaw": ("Poland", "Central European Standard Time"),
+    "Europe/Kiev": ("Ukraine", "FLE Standard Time"),
+    "Europe/Istanbul": ("Turkey", "Turkey Standard Time"),
+    "Europe/Moscow": ("Russia", "Russian Standard Time"),
+    "Asia/Dubai": ("UAE", "Arabian Standard Time"),
+    "Asia/Kolkata": ("India", "Bombay", "Mumbai", "Delhi", "India Standard Time"),
+    "Asia/Shanghai": ("China", "Beijing", "China Standard Time"),
+    "Asia/Hong_Kong": ("HK",),
+    "Asia/Singapore": ("Singapore Standard Time",),
+    "Asia/Tokyo": ("Japan", "Tokyo Standard Time"),
+    "Asia/Seoul": ("Korea", "Korea Standard Time"),
+    "Australia/Sydney": ("Australia", "AUS Eastern Standard Time"),
+    "Pacific/Auckland": ("NZ", "New Zealand", "New Zealand Standard Time"),
+    "Africa/Johannesburg": ("South Africa", "South Africa Standard Time"),
+    "UTC": ("Coordinated Universal Time",),
+}
+
+
+class PhaseStats:
+    """Keeps the durations of the latest calls of every phase of on_suggest and counts hits and misses of the
+    caches"""
+
+    def __init__(self, size):
+        self._size = size
+        self._timings = {}
+        self._hits = collections.Counter()
+        self._misses = collections.Counter()
+        self.current = {}
+
+    @contextlib.contextmanager
+    def phase(self, name, exclude=()):
+        """Measures the duration of the with statement and stores it for the phase, without the durations of the
+        excluded phases within it"""
+        start = time.perf_counter()
+        excluded = sum(self.current.get(phase, 0) for phase in exclude)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            elapsed -= sum(self.current.get(phase, 0) for phase in exclude) - excluded
+            if name not in self._timings:
+                self._timings[name] = collections.deque(maxlen=self._size)
+            self._timings[name].append(elapsed)
+            self.current[name] = self.current.get(name, 0) + elapsed
+
+    def count(self, cache, hit):
+        """Counts a hit or miss of a cache"""
+        if hit:
+            self._hits[cache] += 1
+        else:
+            self._misses[cache] += 1
+
+    def percentiles(self):
+        """Returns a list of (phase, sample count, p50, p99) tuples, durations in milliseconds"""
+        result = []
+        for name, timings in self._timings.items():
+            ordered = sorted(timings)
+            count = len(ordered)
+            result.append(
+                (
+                    name,
+                    count,
+                    ordered[int(round(0.5 * (count - 1)))] * 1000,
+                    ordered[int(round(0.99 * (count - 1)))] * 1000,
+                )
+            )
+        return result
+
+    def hit_rates(self):
+        """Returns a list of (cache, hits, lookups) tuples"""
+        return [
+            (cache, self._hits[cache], self._hits[cache] + self._misses[cache])
+            for cache in sorted(set(self._hits) | set(self._misses))
+        ]
+
+
+class Tracer:
+    """Collects events in the Trace Event Format (viewable in chrome://tracing or Perfetto) in a bounded buffer"""
+
+    def __init__(self, size):
+        self._events = collections.deque(maxlen=size)
+        self._pid = os.getpid()
+
+    @contextlib.contextmanager
+    def span(self, name, category, **args):
+        """Records the with statement as complete event"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.complete(name, category, start, **args)
+
+    def complete(self, name, category, start, **args):
+        """Records a complete event from start (a time.perf_counter() value) until now"""
+        self._events.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": start * 1000000,
+                "dur": (time.perf_counter() - start) * 1000000,
+                "pid": self._pid,
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+        )
+
+    def instant(self, name, category, **args):
+        """Records an instant event"""
+        self._events.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "i",
+                "s": "t",
+                "ts": time.perf_counter() * 1000000,
+                "pid": self._pid,
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+        )
+
+    def write(self, path):
+        """Writes the buffered events to a file and clears the buffer"""
+        events = list(self._events)
+        self._events.clear()
+        with open(path, "w", encoding="utf-8") as trace_file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, trace_file)
+
+
+class HttpPool:
+    """Small HTTP client that keeps connections alive between requests, so the TCP and TLS handshakes are only done
+    once per connection instead of for every request"""
+
+    # errors of a kept connection the server has closed, other errors like timeouts are not worth a retry
+    CLOSED_ERRORS = (
+        http.client.RemoteDisconnected,
+        ConnectionResetError,
+        ConnectionAbortedError,
+        BrokenPipeError,
+    )
+
+    def __init__(
+        self, headers, proxies=None, max_per_host=2, idle_timeout=60, trace=None
+    ):
+        self._headers = dict(headers)
+        self._proxies = proxies if proxies else {}
+        self._max_per_host = max_per_host
+        self._idle_timeout = idle_timeout
+        self._ssl_context = ssl.create_default_context()
+        self._lock = threading.Lock()
+        self._idle = collections.defaultdict(list)
+        self._slots = {}
+        # returns a context manager recording a trace event, given name, category and args
+        self._trace = trace
+
+    @contextlib.contextmanager
+    def open(self, url, timeout=None):
+        """Sends a GET request and yields the response. The connection is kept for further requests to the same host
+        once the with statement ends"""
+        parts = urllib.parse.urlsplit(url)
+        host = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path + ("?" + parts.query if parts.query else "")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        slot = self._slot(host)
+        with self._span("slot"):
+            acquired = slot.acquire(timeout=-1 if timeout is None else timeout)
+        if not acquired:
+            raise TimeoutError("no free connection to {}".format(parts.hostname))
+        try:
+            # next to nothing if a kept connection is reused
+            with self._span("connect"):
+                conn, reused = self._checkout(host, self._remaining(deadline))
+            try:
+                try:
+                    with self._span("response", reused=reused):
+                        resp = self._send(conn, host, url, path)
+                except self.CLOSED_ERRORS:
+                    if not reused:
+                        raise
+                    # the server closed the kept connection in the meantime
+                    conn.close()
+                    with self._span("connect"):
+                        conn = self._connect(host, self._remaining(deadline))
+                    with self._span("response", reused=False):
+                        resp = self._send(conn, host, url, path)
+
+                if resp.status >= 400:
+                    resp.read()
+                    raise urllib.error.HTTPError(
+                        url, resp.status, resp.reason, resp.headers, None
+                    )
+                yield resp
+                resp.read()
+            except BaseException:
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self._checkin(host, conn)
+        finally:
+            slot.release()
+
+    def close(self):
+        """Closes all idle connections"""
+        with self._lock:
+            for conns in self._idle.values():
+                for conn, _ in conns:
+                    conn.close()
+            self._idle.clear()
+
+    def _send(self, conn, host, url, path):
+        """Sends the request over the connection and returns the response"""
+        scheme, hostname, _ = host
+        proxy = self._proxy_for(scheme, hostname)
+        if proxy is not None and scheme == "http":
+            # plain http through a proxy needs the full url as request target
+            headers = dict(self._headers, **self._proxy_headers(proxy))
+            conn.request("GET", url, headers=headers)
+        else:
+            conn.request("GET", path, headers=self._headers)
+        return conn.getresponse()
+
+    def _span(self, name, **args):
+        """Returns a context manager recording a trace event (does nothing without trace)"""
+        if self._trace is None:
+            return contextlib.nullcontext()
+        return self._trace(name, "http", **args)
+
+    @staticmethod
+    def _remaining(deadline):
+        """Returns the time left until the deadline as timeout for a socket, None if there is no deadline"""
+        if deadline is None:
+            return None
+        return max(deadline - time.monotonic(), 0.001)
+
+    def _slot(self, host):
+        """Returns the semaphore limiting the number of concurrent connections to a host"""
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self._max_per_host)
+            return self._slots[host]
+
+    def _checkout(self, host, timeout):
+        """Returns an idle connection to the host or a new one, and whether it is reused"""
+        with self._lock:
+            conns = self._idle[host]
+            while conns:
+                conn, last_used = conns.pop()
+                if time.monotonic() - last_used < self._idle_timeout:
+                    conn.timeout = timeout
+                    if conn.sock is not None:
+                        conn.sock.settimeout(timeout)
+                    return conn, True
+                conn.close()
+        return self._connect(host, timeout), False
+
+    def _checkin(self, host, conn):
+        """Keeps a connection for further requests"""
+        with self._lock:
+            self._idle[host].append((conn, time.monotonic()))
+
+    def _connect(self, host, timeout):
+        """Creates a new connection to the host, through the proxy if one is configured"""
+        scheme, hostname, port = host
+        proxy = self._proxy_for(scheme, hostname)
+        if proxy is None:
+            if scheme == "https":
+                return http.client.HTTPSConnection(
+                    hostname, port, timeout=timeout, context=self._ssl_context
+                )
+            return http.client.HTTPConnection(hostname, port, timeout=timeout)
+
+        proxy_parts = urllib.parse.urlsplit(proxy)
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(
+                proxy_parts.hostname,
+                proxy_parts.port,
+                timeout=timeout,
+                context=self._ssl_context,
+            )
+            conn.set_tunnel(hostname, port, headers=self._proxy_headers(proxy))
+            return conn
+        return http.client.HTTPConnection(
+            proxy_parts.hostname, proxy_parts.port, timeout=timeout
+        )
+
+    def _proxy_for(self, scheme, hostname):
+        """Returns the url of the proxy to use for a request or None if there is no proxy to use"""
+        proxy = self._proxies.get(scheme)
+        if not proxy:
+            return None
+        for no_proxy in self._proxies.get("no", "").split(","):
+            no_proxy = no_proxy.strip().lstrip(".")
+            if no_proxy and (hostname == no_proxy or hostname.endswith("." + no_proxy)):
+                return None
+        return proxy if "://" in proxy else "http://" + proxy
+
+    @staticmethod
+    def _proxy_headers(proxy):
+        """Returns the headers for authenticating at the proxy"""
+        proxy_parts = urllib.parse.urlsplit(proxy)
+        if not proxy_parts.username:
+            return {}
+        credentials = "{}:{}".format(
+            urllib.parse.unquote(proxy_parts.username),
+            urllib.parse.unquote(proxy_parts.password or ""),
+        )
+        return {
+            "Proxy-Authorization": "Basic "
+            + base64.b64encode(credentials.encode()).decode("ascii")
+        }
+
+
+class CircuitBreaker:
+    """Stops requests to a provider for a cool-down period after it failed several times in a row"""
+
+    def __init__(self, max_failures, cooldown):
+        self._max_failures = max_failures
+        self._cooldown = cooldown
+        self._lock = threading.Lock()
+        self._open_until = 0
+        self._trial_until = 0
+        self.failures_in_row = 0
+        self.failures = 0
+        self.successes = 0
+
+    def allow(self):
+        """Returns whether a request may be sent to the provider. After the cool-down a single trial request is
+        allowed, another one only if it doesn't report back within a cool-down period"""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._open_until:
+                return False
+            if self.failures_in_row < self._max_failures:
+                return True
+            if now < self._trial_until:
+                return False
+            self._trial_until = now + self._cooldown
+            return True
+
+    def success(self):
+        """Records a successful request"""
+        with self._lock:
+            self.successes += 1
+            self.failures_in_row = 0
+            self._open_until = 0
+            self._trial_until = 0
+
+    def failure(self):
+        """Records a failed request, too many in a row start the cool-down"""
+        with self._lock:
+            self.failures += 1
+            self.failures_in_row += 1
+            if self.failures_in_row >= self._max_failures:
+                self._open_until = time.monotonic() + self._cooldown
+
+    def state(self):
+        """Returns "open" during the cool-down, "half-open" after it until the next request succeeds and "closed"
+        otherwise"""
+        with self._lock:
+            if self.failures_in_row < self._max_failures:
+                return "closed"
+            if time.monotonic() < self._open_until:
+                return "open"
+            return "half-open"
+
+
+class NominatimProvider:
+    """Searches locations by name with a Nominatim server (https://nominatim.org/)"""
+
+    def __init__(self, base_url):
+        self._base_url = base_url.rstrip("/")
+        self.name = self._base_url + "/search"
+
+    def locate(self, fetch_json, query, limit, timeout):
+        """Returns a list of found locations (dicts with name, display_name, lat and lon)"""
+        return fetch_json(
+            "{}/search?format=json&addressdetails=0&limit={}&q={}".format(
+                self._base_url, limit, urllib.parse.quote_plus(query)
+            ),
+            timeout,
+        )
+
+
+class GeoTimezoneProvider:
+    """Determines the timezone at a location with the GeoTimezone API (https://www.geotimezone.com/)"""
+
+    def __init__(self, base_url):
+        self._base_url = base_url.rstrip("/")
+        self.name = self._base_url + "/public/timezone"
+
+    def timezone(self, fetch_json, lat, lon, timeout):
+        """Returns the name of the timezone at a location"""
+        return fetch_json(
+            "{}/public/timezone?latitude={}&longitude={}".format(
+                self._base_url, lat, lon
+            ),
+            timeout,
+        ).get("iana_timezone")
+
+
+class FileProvider:
+    """Searches locations and their timezones in a local json file, which contains a list of objects with the keys
+    name, lat, lon, timezone and optionally display_name"""
+
+    def __init__(self, path):
+        self.name = path
+        self._path = path
+        self._places = None
+
+    def locate(self, fetch_json, query, limit, timeout):
+        """Returns a list of found locations (dicts with name, display_name, lat, lon and timezone)"""
+        found = []
+        for place in self._load():
+            if query not in place["name"].casefold():
+                continue
+            found.append(
+                {
+                    "name": place["name"],
+                    "display_name": place.get("display_name", place["name"]),
+                    "lat": str(place["lat"]),
+                    "lon": str(place["lon"]),
+                    "timezone": place["timezone"],
+                }
+            )
+            if len(found) >= limit:
+                break
+        return found
+
+    def timezone(self, fetch_json, lat, lon, timeout):
+        """Returns the name of the timezone at a location, if the location is in the file"""
+        for place in self._load():
+            if str(place["lat"]) == lat and str(place["lon"]) == lon:
+                return place["timezone"]
+        return None
+
+    def _load(self):
+        """Reads the file on first use"""
+        if self._places is None:
+            with open(self._path, encoding="utf-8") as places_file:
+                self._places = json.load(places_file)
+        return self._places
 
 
 class Time(kp.Plugin):
@@ -30,7 +535,38 @@ class Time(kp.Plugin):
     DEFAULT_ITEM_LABEL = "Time:"
     DEFAULT_ITEM_LABEL2 = "Timezone:"
     DEFAULT_ONLINE = True
+    DEFAULT_LOCATION_PROVIDERS = ["https://nominatim.openstreetmap.org"]
+    DEFAULT_TIMEZONE_PROVIDERS = ["https://api.geotimezone.com"]
+    HEDGE_DELAY = 1.0
+    HEDGE_SAMPLES = 50
+    HEDGE_MIN_SAMPLES = 5
+    DEFAULT_ONLINE_MIN_LENGTH = 3
+    DEFAULT_ONLINE_DELAY = 0.5
+    NEGATIVE_CACHE_SECONDS = 60
+    DEFAULT_ONLINE_TIMEOUT = 3.0
+    BREAKER_FAILURES = 3
+    BREAKER_COOLDOWN = 60
+    ONLINE_RESULTS = 5
+    READ_CHUNK_SIZE = 16384
+    DEFAULT_LATLON_PRECISION = 2
+    GRID_CONFIRMATIONS = 2
+    DEFAULT_WARMUP = True
+    DEFAULT_STATS = False
+    STATS_KEYWORD = "stats"
+    STATS_SIZE = 1000
+    DEFAULT_SLOW_INPUT_MS = 0
+    SLOW_INPUT_LOG = "slow_inputs.jsonl"
+    SLOW_INPUT_LOG_SIZE = 100
+    DEFAULT_TRACE = False
+    TRACE_KEYWORD = "trace"
+    TRACE_SIZE = 100000
+    DEFAULT_PROFILE = False
+    PROFILE_KEYWORD = "profile"
+    PROFILE_CALLS = 50
+    PROFILE_FILES = 5
     COPY_TO_CB = "(press Enter to copy to clipboard)"
+    SUGGESTION_CACHE_SIZE = 100
+    NOW_ZONES = 5
 
     def __init__(self):
         super().__init__()
@@ -39,15 +575,71 @@ class Time(kp.Plugin):
         self._item_label = self.DEFAULT_ITEM_LABEL
         self._item_label2 = self.DEFAULT_ITEM_LABEL2
         self._online = self.DEFAULT_ONLINE
-        self._urlopener = self._build_urlopener()
+        self._online_min_length = self.DEFAULT_ONLINE_MIN_LENGTH
+        self._online_delay = self.DEFAULT_ONLINE_DELAY
+        self._latlon_precision = self.DEFAULT_LATLON_PRECISION
+        self._online_timeout = self.DEFAULT_ONLINE_TIMEOUT
+        self._breakers = {}
+        self._latencies = {}
+        self._location_providers = self._build_providers(
+            self.DEFAULT_LOCATION_PROVIDERS, NominatimProvider
+        )
+        self._timezone_providers = self._build_providers(
+            self.DEFAULT_TIMEZONE_PROVIDERS, GeoTimezoneProvider
+        )
+        self._executor = None
+        self._warmup = self.DEFAULT_WARMUP
+        self._stats = None
+        self._show_stats = self.DEFAULT_STATS
+        self._slow_input_ms = self.DEFAULT_SLOW_INPUT_MS
+        self._tracer = None
+        self._profile_enabled = self.DEFAULT_PROFILE
+        self._profile_calls = 0
+        self._profile_stats = None
+        self._http = self._build_http_client()
         self._location_cache = {}
         self._latlon_cache = {}
+        self._negative_cache = {}
+        self._grid_cache = {}
+        self._grid_checks = set()
+        self._online_requests = {}
+        self._online_lock = threading.Lock()
+        self._suggestion_cache = collections.OrderedDict()
+        self._now_cache = {}
+        self._now_zones = collections.OrderedDict([(None, None)])
+        self._now_lock = threading.Lock()
+        self._now_active = threading.Event()
+        self._now_thread = None
+        self._locale_lock = threading.Lock()
+        self._zone_lock = threading.Lock()
+        self._zone_suggestions = None
+        self._zone_suggestions_until = 0
+        self._zone_index = {}
+        self._zone_tokens = []
+        self._zone_offsets = {}
 
     def on_start(self):
         self._read_config()
         self.set_default_icon(
             self.load_icon("res://{}/clock.ico".format(self.package_full_name()))
         )
+        if self._warmup:
+            threading.Thread(
+                target=self._warm_up, name="TimeWarmUp", daemon=True
+            ).start()
+
+    def on_activated(self):
+        """Starts rendering the suggestions for the current time ahead while the launcher is shown"""
+        self._now_active.set()
+        if self._now_thread is None or not self._now_thread.is_alive():
+            self._now_thread = threading.Thread(
+                target=self._render_now_ahead, name="TimeNow", daemon=True
+            )
+            self._now_thread.start()
+
+    def on_deactivated(self):
+        """Stops rendering the suggestions for the current time ahead"""
+        self._now_active.clear()
 
     def on_events(self, flags):
         """Reloads the package config when its changed"""
@@ -56,8 +648,9 @@ class Time(kp.Plugin):
             self.on_catalog()
 
         if flags & kp.Events.NETOPTIONS:
-            self.dbg("Network settings changed: rebuilding urlopener")
-            self._urlopener = self._build_urlopener()
+            self.dbg("Network settings changed: rebuilding http client")
+            self._http.close()
+            self._http = self._build_http_client()
 
     def _read_config(self):
         """Reads the config"""
@@ -85,9 +678,88 @@ class Time(kp.Plugin):
         self._online = settings.get_bool("online", "main", self.DEFAULT_ONLINE)
         self.dbg("online =", self._online)
 
-    def _build_urlopener(self):
-        """Creates an urllib opener with some request headers and returns it"""
-        self.dbg("Building urlopener")
+        self._online_min_length = settings.get_int(
+            "online_min_length", "main", self.DEFAULT_ONLINE_MIN_LENGTH, min=1
+        )
+        self.dbg("online_min_length =", self._online_min_length)
+
+        self._online_delay = settings.get_float(
+            "online_delay", "main", self.DEFAULT_ONLINE_DELAY, min=0
+        )
+        self.dbg("online_delay =", self._online_delay)
+
+        self._online_timeout = settings.get_float(
+            "online_timeout", "main", self.DEFAULT_ONLINE_TIMEOUT, min=0.1
+        )
+        self.dbg("online_timeout =", self._online_timeout)
+
+        self._location_providers = self._build_providers(
+            settings.get_multiline(
+                "location_providers", "main", self.DEFAULT_LOCATION_PROVIDERS
+            ),
+            NominatimProvider,
+        )
+        self.dbg("location_providers =", [p.name for p in self._location_providers])
+
+        self._timezone_providers = self._build_providers(
+            settings.get_multiline(
+                "timezone_providers", "main", self.DEFAULT_TIMEZONE_PROVIDERS
+            ),
+            GeoTimezoneProvider,
+        )
+        self.dbg("timezone_providers =", [p.name for p in self._timezone_providers])
+
+        self._latlon_precision = settings.get_int(
+            "latlon_precision", "main", self.DEFAULT_LATLON_PRECISION, min=0, max=6
+        )
+        self.dbg("latlon_precision =", self._latlon_precision)
+
+        self._warmup = settings.get_bool("warmup", "main", self.DEFAULT_WARMUP)
+        self.dbg("warmup =", self._warmup)
+
+        self._show_stats = settings.get_bool("stats", "main", self.DEFAULT_STATS)
+        self.dbg("stats =", self._show_stats)
+
+        self._slow_input_ms = settings.get_int(
+            "slow_input_ms", "main", self.DEFAULT_SLOW_INPUT_MS, min=0
+        )
+        self.dbg("slow_input_ms =", self._slow_input_ms)
+
+        if not self._show_stats and not self._slow_input_ms:
+            self._stats = None
+        elif self._stats is None:
+            self._stats = PhaseStats(self.STATS_SIZE)
+
+        if not settings.get_bool("trace", "main", self.DEFAULT_TRACE):
+            self._tracer = None
+        elif self._tracer is None:
+            self._tracer = Tracer(self.TRACE_SIZE)
+        self.dbg("trace =", self._tracer is not None)
+
+        profile_enabled = settings.get_bool("profile", "main", self.DEFAULT_PROFILE)
+        if profile_enabled and not self._profile_enabled:
+            self._start_profile()
+        elif not profile_enabled:
+            self._profile_calls = 0
+            self._profile_stats = None
+        self._profile_enabled = profile_enabled
+        self.dbg("profile =", self._profile_enabled)
+
+    @staticmethod
+    def _build_providers(entries, url_provider):
+        """Creates the providers for the configured entries, "file:" entries are local files, anything else is the
+        base url of a server"""
+        providers = []
+        for entry in entries:
+            if entry.startswith("file:"):
+                providers.append(FileProvider(entry[len("file:") :].strip()))
+            else:
+                providers.append(url_provider(entry))
+        return providers
+
+    def _build_http_client(self):
+        """Creates a http client with some request headers and the proxies configured in Keypirinha and returns it"""
+        self.dbg("Building http client")
         user_agent = "{}/{} python-{}/{}.{}.{}".format(
             kp.name(),
             kp.version_string(),
@@ -96,16 +768,28 @@ class Time(kp.Plugin):
             sys.version_info[1],
             sys.version_info[2],
         )
-        opener = kpn.build_urllib_opener()
-        opener.addheaders = [("Accept-Encoding", "gzip"), ("User-Agent", user_agent)]
-        return opener
+        proxies = {}
+        for handler in kpn.build_urllib_opener().handlers:
+            if isinstance(handler, urllib.request.ProxyHandler):
+                proxies = handler.proxies
+        return HttpPool(
+            [("Accept-Encoding", "gzip"), ("User-Agent", user_agent)],
+            proxies,
+            trace=self._trace,
+        )
 
     def on_catalog(self):
         """Adds the kill command to the catalog"""
 
         # clear cache
-        self._location_cache = {}
-        self._latlon_cache = {}
+        with self._online_lock:
+            self._location_cache = {}
+            self._latlon_cache = {}
+            self._negative_cache = {}
+            self._grid_cache = {}
+        self._suggestion_cache = collections.OrderedDict()
+        with self._now_lock:
+            self._now_cache = {}
 
         catalog = [
             self.create_item(
@@ -127,9 +811,11 @@ class Time(kp.Plugin):
         ]
         self.set_catalog(catalog)
 
-    def _create_suggestions(self, timetoshow):
-        """Creates various catalog items with different formats and locales for a given datetime object"""
+    def _create_suggestions(self, timetoshow, timezone, interruptible=True):
+        """Creates various catalog items with different formats and locales for a given datetime object. Stops early
+        if the suggestions are not needed anymore, unless not interruptible"""
         suggestions = []
+        data_bag = self._to_data_bag(timetoshow, timezone)
 
         try:
             suggestions.append(
@@ -143,6 +829,7 @@ class Time(kp.Plugin):
                     args_hint=kp.ItemArgsHint.ACCEPTED,
                     hit_hint=kp.ItemHitHint.IGNORE,
                     loop_on_suggest=True,
+                    data_bag=data_bag,
                 )
             )
             suggestions.append(
@@ -156,6 +843,7 @@ class Time(kp.Plugin):
                     args_hint=kp.ItemArgsHint.ACCEPTED,
                     hit_hint=kp.ItemHitHint.IGNORE,
                     loop_on_suggest=True,
+                    data_bag=data_bag,
                 )
             )
         except OSError as ex:
@@ -170,6 +858,7 @@ class Time(kp.Plugin):
                 args_hint=kp.ItemArgsHint.ACCEPTED,
                 hit_hint=kp.ItemHitHint.IGNORE,
                 loop_on_suggest=True,
+                data_bag=data_bag,
             )
         )
         suggestions.append(
@@ -181,10 +870,13 @@ class Time(kp.Plugin):
                 args_hint=kp.ItemArgsHint.ACCEPTED,
                 hit_hint=kp.ItemHitHint.IGNORE,
                 loop_on_suggest=True,
+                data_bag=data_bag,
             )
         )
 
         for idx, frmt in enumerate(self._formats):
+            if interruptible and self.should_terminate():
+                break
             for loc in self._locales:
                 try:
                     with self.__setlocale(loc):
@@ -198,6 +890,7 @@ class Time(kp.Plugin):
                             args_hint=kp.ItemArgsHint.ACCEPTED,
                             hit_hint=kp.ItemHitHint.IGNORE,
                             loop_on_suggest=True,
+                            data_bag=data_bag,
                         )
                         if not self.__contains_item(suggestions, item):
                             suggestions.append(item)
@@ -206,6 +899,150 @@ class Time(kp.Plugin):
 
         return suggestions
 
+    def _create_now_suggestions(self, timezone):
+        """Creates the catalog items for the current time (to the second). While the launcher is shown they are
+        rendered ahead for the recently used timezones (see _render_now_ahead)"""
+        now = datetime.datetime.now().replace(microsecond=0)
+        with self._now_lock:
+            self._now_zones[timezone] = None
+            self._now_zones.move_to_end(timezone)
+            if len(self._now_zones) > self.NOW_ZONES:
+                self._now_zones.popitem(last=False)
+            cached = self._now_cache.get((timezone, now))
+        self._count("now", cached is not None)
+        if cached is not None:
+            self.dbg("using cached suggestions for now:", now)
+            return cached
+
+        with self._phase("render"):
+            suggestions = self._render_now(now, timezone, True)
+        if not self.should_terminate():
+            with self._now_lock:
+                self.__prune_now_cache(now)
+                self._now_cache[(timezone, now)] = suggestions
+        return suggestions
+
+    def _render_now(self, now, timezone, foreground):
+        """Creates the catalog items for a second in a timezone. In the background the rendering is neither measured
+        nor interrupted by new user input"""
+        if not timezone:
+            tz = None
+        elif foreground:
+            tz = self._gettz(timezone)
+        else:
+            tz = dateutil.tz.gettz(timezone)
+        timetoshow = now.astimezone(tz=tz)
+        self.dbg("timetoshow", timetoshow)
+        return self._create_suggestions(timetoshow, timezone, foreground)
+
+    def __prune_now_cache(self, current):
+        """Removes the suggestions for seconds that have passed"""
+        for key in [key for key in self._now_cache if key[1] < current]:
+            del self._now_cache[key]
+
+    def _render_now_ahead(self):
+        """Renders the suggestions for the current and the next second for the recently used timezones, so opening
+        the Time or Timezone item finds them ready. Runs while the launcher is shown, waking up shortly after every
+        second boundary"""
+        self.dbg("Rendering now ahead")
+        while self._now_active.is_set():
+            current = datetime.datetime.now().replace(microsecond=0)
+            seconds = (current, current + datetime.timedelta(seconds=1))
+            with self._now_lock:
+                zones = list(self._now_zones)
+                self.__prune_now_cache(current)
+            try:
+                with self._trace("now", "background"):
+                    for second in seconds:
+                        for timezone in zones:
+                            with self._now_lock:
+                                if (timezone, second) in self._now_cache:
+                                    continue
+                            suggestions = self._render_now(second, timezone, False)
+                            with self._now_lock:
+                                self._now_cache[(timezone, second)] = suggestions
+            except Exception as ex:
+                self.warn(
+                    "Rendering now ahead failed:", ex, "\n", traceback.format_exc()
+                )
+                return
+            wake_up = seconds[1] + datetime.timedelta(milliseconds=100)
+            time.sleep(max((wake_up - datetime.datetime.now()).total_seconds(), 0))
+        self.dbg("Stopped rendering now ahead")
+
+    def _create_input_suggestions(self, user_input, timezone):
+        """Parses the user input and creates the catalog items for it"""
+        try:
+            if int(user_input) < 86400:
+                self.dbg("Timestamps smaller than 86400 do not work.")
+                return []
+        except ValueError as ex:
+            self.dbg("Input error: ", ex, "\n", traceback.format_exc())
+
+        with self._phase("parse"):
+            parsed = self._tryparse(user_input)
+        self.dbg("parsed time", parsed)
+        if self.should_terminate():
+            return []
+        if parsed is None:
+            return self._create_found_suggestions(user_input, timezone)
+
+        tz = self._gettz(timezone) if timezone else None
+        if tz:
+            timetoshow = parsed.replace(tzinfo=tz)
+        else:
+            # also for timezones that are unknown to the bundled timezone database
+            timetoshow = parsed.astimezone()
+        with self._phase("render"):
+            return self._create_suggestions(timetoshow, timezone)
+
+    def _create_found_suggestions(self, text, timezone):
+        """Creates a catalog item for every datetime that could be found within a longer text"""
+        suggestions = []
+        with self._phase("scan"):
+            found_timestamps = self._find_timestamps(text)
+        tz = self._gettz(timezone) if timezone and found_timestamps else None
+        for idx, (span, found) in enumerate(found_timestamps):
+            if tz:
+                timetoshow = found.replace(tzinfo=tz)
+            else:
+                timetoshow = found.astimezone()
+            data_bag = self._to_data_bag(timetoshow, timezone)
+            suggestions.append(
+                self.create_item(
+                    category=kp.ItemCategory.KEYWORD,
+                    label=timetoshow.isoformat(),
+                    short_desc="Time found in input '{}' {}".format(
+                        text[span[0] : span[1]], self.COPY_TO_CB
+                    ),
+                    target="found_{}".format(idx),
+                    args_hint=kp.ItemArgsHint.ACCEPTED,
+                    hit_hint=kp.ItemHitHint.IGNORE,
+                    loop_on_suggest=True,
+                    data_bag=data_bag,
+                )
+            )
+        return suggestions
+
+    @staticmethod
+    def _to_data_bag(timetoshow, timezone):
+        """Encodes an aware datetime as microseconds since the epoch and the name of its timezone, so the items
+        further down the items_chain can restore it exactly without parsing their (maybe localized) label
+        text"""
+        micros = (timetoshow - EPOCH) // datetime.timedelta(microseconds=1)
+        return "{}|{}".format(micros, timezone if timezone else "")
+
+    @staticmethod
+    def _from_data_bag(data_bag):
+        """Restores the aware datetime from the data bag of a suggestion (see _to_data_bag). Returns None if the data
+        bag is empty or malformed"""
+        micros, _, timezone = (data_bag or "").partition("|")
+        try:
+            utc = EPOCH + datetime.timedelta(microseconds=int(micros))
+            return utc.astimezone(dateutil.tz.gettz(timezone) if timezone else None)
+        except (ValueError, OverflowError):
+            return None
+
     @staticmethod
     def __contains_item(suggestions, search):
         """Checks if a catalog item with the same label is already in the collection"""
@@ -221,13 +1058,34 @@ class Time(kp.Plugin):
         :param name: See https://docs.microsoft.com/en-us/cpp/c-runtime-library/language-strings?view=vs-2017 for
             possible values
         """
-        saved = locale.setlocale(locale.LC_TIME)
-        try:
-            yield locale.setlocale(locale.LC_TIME, name)
-        finally:
-            locale.setlocale(locale.LC_TIME, saved)
+        # the locale is process wide, suggestions may be rendered on a background thread at the same time
+        with self._locale_lock:
+            saved = locale.setlocale(locale.LC_TIME)
+            try:
+                yield locale.setlocale(locale.LC_TIME, name)
+            finally:
+                locale.setlocale(locale.LC_TIME, saved)
 
     def on_suggest(self, user_input, items_chain):
+        with self._profile():
+            if self._stats is None:
+                with self._trace("on_suggest", "suggest", user_input=user_input):
+                    self._suggest(user_input, items_chain)
+                return
+
+            self._stats.current = {}
+            with self._stats.phase("on_suggest", exclude=["debounce"]), self._trace(
+                "on_suggest", "suggest", user_input=user_input
+            ):
+                self._suggest(user_input, items_chain)
+            if (
+                self._slow_input_ms
+                and self._stats.current["on_suggest"] * 1000 >= self._slow_input_ms
+            ):
+                self._log_slow_input(user_input, items_chain, self._stats.current)
+
+    def _suggest(self, user_input, items_chain):
+        """Creates the suggestions for the user input depending on the items_chain"""
         if not items_chain:
             return
 
@@ -238,23 +1096,75 @@ class Time(kp.Plugin):
         ):
             timezone = items_chain[-1].target() if len(items_chain) > 1 else None
             self.dbg("timezone", timezone)
-            if user_input:
-                try:
-                    if int(user_input) < 86400:
-                        self.dbg("Timestamps smaller than 86400 do not work.")
-                        return
-                except ValueError as ex:
-                    self.dbg("Input error: ", ex, "\n", traceback.format_exc())
-
-                parsed = self._tryparse(user_input)
-                self.dbg("parsed time", parsed)
-                if parsed is None:
-                    return
+            if (
+                self._show_stats
+                and user_input == self.STATS_KEYWORD
+                and len(items_chain) == 1
+            ):
+                self.set_suggestions(
+                    self._create_stats_suggestions(), kp.Match.ANY, kp.Sort.NONE
+                )
+                return
+            if (
+                self._tracer is not None
+                and user_input == self.TRACE_KEYWORD
+                and len(items_chain) == 1
+            ):
+                self.set_suggestions(
+                    [
+                        self.create_item(
+                            category=kp.ItemCategory.KEYWORD,
+                            label="Write trace file",
+                            short_desc="Writes the recorded events to a file in the package cache directory "
+                            "(press Enter to write and copy the path to clipboard)",
+                            target="trace_write",
+                            args_hint=kp.ItemArgsHint.FORBIDDEN,
+                            hit_hint=kp.ItemHitHint.IGNORE,
+                        )
+                    ],
+                    kp.Match.ANY,
+                    kp.Sort.NONE,
+                )
+                return
+            if (
+                self._profile_enabled
+                and user_input == self.PROFILE_KEYWORD
+                and len(items_chain) == 1
+            ):
+                self.set_suggestions(
+                    [
+                        self.create_item(
+                            category=kp.ItemCategory.KEYWORD,
+                            label="Profile the next {} calls".format(
+                                self.PROFILE_CALLS
+                            ),
+                            short_desc="Profiles the next calls of the plugin and writes the results to a .pstats "
+                            "file in the package cache directory (press Enter to start)",
+                            target="profile_start",
+                            args_hint=kp.ItemArgsHint.FORBIDDEN,
+                            hit_hint=kp.ItemHitHint.IGNORE,
+                        )
+                    ],
+                    kp.Match.ANY,
+                    kp.Sort.NONE,
+                )
+                return
 
-                if timezone:
-                    timetoshow = parsed.replace(tzinfo=dateutil.tz.gettz(timezone))
+            if user_input:
+                # the date is part of the key, because inputs without one are relative to today
+                cache_key = (user_input, timezone, datetime.date.today())
+                self._count("suggestions", cache_key in self._suggestion_cache)
+                if cache_key in self._suggestion_cache:
+                    self.dbg("using cached suggestions for input:", user_input)
+                    self._suggestion_cache.move_to_end(cache_key)
+                    suggestions = self._suggestion_cache[cache_key]
                 else:
-                    timetoshow = parsed.astimezone()
+                    suggestions = self._create_input_suggestions(user_input, timezone)
+                    if self.should_terminate():
+                        return
+                    self._suggestion_cache[cache_key] = suggestions
+                    if len(self._suggestion_cache) > self.SUGGESTION_CACHE_SIZE:
+                        self._suggestion_cache.popitem(last=False)
             else:
                 if (
                     items_chain[0].target() == "time"
@@ -262,18 +1172,24 @@ class Time(kp.Plugin):
                     or items_chain[0].target() == "timezone"
                     and len(items_chain) > 2
                 ):
-                    time_wo_zone = self._tryparse(items_chain[-2].label())
-                else:
-                    time_wo_zone = datetime.datetime.now()
-
-                if timezone:
-                    timetoshow = time_wo_zone.astimezone(tz=dateutil.tz.gettz(timezone))
+                    previous_time = self._from_data_bag(items_chain[-2].data_bag())
+                    if previous_time is None:
+                        previous_time = self._tryparse(items_chain[-2].label())
+                    if previous_time is None:
+                        return
+                    if timezone:
+                        timetoshow = previous_time.astimezone(tz=self._gettz(timezone))
+                    else:
+                        timetoshow = previous_time.astimezone()
+                    self.dbg("timetoshow", timetoshow)
+                    with self._phase("render"):
+                        suggestions = self._create_suggestions(timetoshow, timezone)
                 else:
-                    timetoshow = time_wo_zone.astimezone()
-                self.dbg("timetoshow", timetoshow)
+                    suggestions = self._create_now_suggestions(timezone)
+                if self.should_terminate():
+                    return
 
-            if timetoshow:
-                suggestions = self._create_suggestions(timetoshow)
+            if suggestions:
                 self.set_suggestions(suggestions, kp.Match.ANY, kp.Sort.NONE)
         elif (
             (len(items_chain) % 2 == 1) and items_chain[0].target() == "timezone"
@@ -282,19 +1198,59 @@ class Time(kp.Plugin):
             and len(items_chain) % 2 == 0
             and items_chain[0].target() == "time"
         ):
+            with self._phase("zones"):
+                suggestions = self._search_zones(user_input)
+                if suggestions:
+                    # already ranked, keypirinha must not filter or sort them again
+                    match, sort = kp.Match.ANY, kp.Sort.NONE
+                else:
+                    suggestions = list(self._create_zone_suggestions())
+                    match, sort = kp.Match.DEFAULT, kp.Sort.DEFAULT
+            if self.should_terminate():
+                return
+            self.set_suggestions(suggestions, match, sort)
+
+            if not self._online or len(user_input.strip()) < self._online_min_length:
+                return
+            # waiting for the next keystroke, this doesn't count as time spent on the input
+            with self._phase("debounce"):
+                superseded = self.should_terminate(self._online_delay)
+            if superseded:
+                return
+            with self._phase("online"):
+                suggestions.extend(self._get_online_suggestions(user_input))
+            if self.should_terminate():
+                return
+            self.set_suggestions(suggestions, match, sort)
+
+    def _create_zone_suggestions(self):
+        """Creates a catalog item for every known timezone, the search index over them and the timezones by their
+        current offset. All are reused until one of the timezones reaches its next
+        transition"""
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
+        with self._zone_lock:
+            if (
+                self._zone_suggestions
+                and now.timestamp() < self._zone_suggestions_until
+            ):
+                self._count("zones", True)
+                return self._zone_suggestions
+            self._count("zones", False)
+
+            self.dbg("Creating timezone suggestions")
             suggestions = []
-            for (
-                name,
-                timezone,
-            ) in dateutil.zoneinfo.get_zonefile_instance().zones.items():
+            index = {}
+            offsets = {}
+            until = float("inf")
+            with self._trace("zoneinfo", "zoneinfo"):
+                zones = dateutil.zoneinfo.get_zonefile_instance().zones
+            for name, timezone in zones.items():
                 suggestions.append(
                     self.create_item(
                         category=kp.ItemCategory.KEYWORD,
                         label="{} ({})".format(
                             name.replace("_", " "),
-                            datetime.datetime.utcnow()
-                            .astimezone(tz=timezone)
-                            .strftime("%z"),
+                            now.astimezone(tz=timezone).strftime("%z"),
                         ),
                         short_desc="Time in timezone '{}'".format(name),
                         target=name,
@@ -303,63 +1259,153 @@ class Time(kp.Plugin):
                         loop_on_suggest=True,
                     )
                 )
-            self.set_suggestions(suggestions)
+                for token, weight in self.__zone_tokens(name, timezone, now).items():
+                    index.setdefault(token, []).append((len(suggestions) - 1, weight))
+                offset = now.astimezone(tz=timezone).utcoffset()
+                offsets.setdefault(offset, []).append(len(suggestions) - 1)
+                until = min(until, self.__next_transition(timezone, now))
+            self._zone_suggestions = suggestions
+            self._zone_suggestions_until = until
+            self._zone_index = index
+            self._zone_tokens = sorted(index)
+            self._zone_offsets = offsets
+            return suggestions
 
-            if self._online and user_input and not self.should_terminate(0.5):
-                suggestions.extend(self._get_online_suggestions(user_input))
-                self.set_suggestions(suggestions)
+    @staticmethod
+    def __zone_tokens(name, timezone, now):
+        """Returns the words a timezone can be found by with their weights: the parts of its name weigh 2, its
+        aliases and abbreviations (EST, CEST, ...) 1"""
+        words = [now.astimezone(tz=timezone).tzname() or ""]
+        words.extend(ZONE_ALIASES.get(name, ()))
+        for ttinfo in (
+            getattr(timezone, "_ttinfo_std", None),
+            getattr(timezone, "_ttinfo_dst", None),
+        ):
+            if ttinfo is not None:
+                words.append(ttinfo.abbr)
+        tokens = dict.fromkeys(
+            (
+                token
+                for word in words
+                for token in ZONE_TOKEN_RE.findall(word.casefold())
+            ),
+            1,
+        )
+        tokens.update(dict.fromkeys(ZONE_TOKEN_RE.findall(name.casefold()), 2))
+        return tokens
+
+    def _search_zones(self, user_input):
+        """Returns the timezone suggestions that currently have the UTC offset in the user_input, or that match every
+        word of the user_input. Matches of the name rank above matches of aliases and abbreviations, exact matches of
+        a word above prefix matches and shorter names above longer ones. Returns None if nothing
+        matches"""
+        words = ZONE_TOKEN_RE.findall(user_input.casefold())
+        if not words:
+            return None
+        self._create_zone_suggestions()
+        with self._zone_lock:
+            suggestions = self._zone_suggestions
+            index = self._zone_index
+            tokens = self._zone_tokens
+            offsets = self._zone_offsets
+
+        match = ZONE_OFFSET_RE.match(user_input.strip())
+        if match:
+            sign, hours, minutes = match.groups()
+            offset = datetime.timedelta(hours=int(hours), minutes=int(minutes or 0))
+            zones = offsets.get(-offset if sign == "-" else offset)
+            return [suggestions[i] for i in zones] if zones else None
+
+        scores = None
+        for word in words:
+            word_scores = {}
+            # the tokens starting with the word are next to each other in the sorted list
+            pos = bisect.bisect_left(tokens, word)
+            while pos < len(tokens) and tokens[pos].startswith(word):
+                exact = 2 if tokens[pos] == word else 1
+                for i, weight in index[tokens[pos]]:
+                    word_scores[i] = max(word_scores.get(i, 0), weight * exact)
+                pos += 1
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {
+                    i: score + word_scores[i]
+                    for i, score in scores.items()
+                    if i in word_scores
+                }
+            if not scores:
+                return None
+        return [
+            suggestions[i]
+            for i in sorted(
+                scores,
+                key=lambda i: (-scores[i], len(suggestions[i].target()), i),
+            )
+        ]
+
+    @staticmethod
+    def __next_transition(timezone, now):
+        """Returns the timestamp of the next transition of a timezone after now (infinity if there is none)"""
+        trans_list = getattr(timezone, "_trans_list_utc", ())
+        idx = bisect.bisect_right(trans_list, now.timestamp())
+        return trans_list[idx] if idx < len(trans_list) else float("inf")
+
+    def _warm_up(self):
+        """Loads the timezone data, initializes the date parser and creates the timezone suggestions, so that doesn't
+        have to happen on the first keystrokes"""
+        self.dbg("Warming up")
+        try:
+            with self._trace("warm-up", "background"):
+                dateutil.parser.parse("Jan 01 2000 00:00:00")
+                self._create_zone_suggestions()
+        except Exception as ex:
+            self.warn("Warm-up failed:", ex, "\n", traceback.format_exc())
+        self.dbg("Warm-up done")
 
     def _get_online_suggestions(self, user_input):
         """Trys to search the user_input as location name and queries their respective timezones. Returns a list of
         keypirinha suggestions"""
         suggestions = []
-        if user_input in self._location_cache:
-            self.dbg("using cached results for input:", user_input)
-            results = self._location_cache[user_input]
-        else:
-            req = urllib.request.Request(
-                "https://nominatim.openstreetmap.org/search?format=json&q="
-                + urllib.parse.quote_plus(user_input)
-            )
-            with self._urlopener.open(req) as resp:
-                if resp.info().get("Content-Encoding") == "gzip":
-                    results = json.loads(gzip.decompress(resp.read()).decode())
-                else:
-                    results = json.loads(resp.read().decode())
-            self.dbg("putting results in cache for input:", user_input)
-            self._location_cache[user_input] = results
+        deadline = time.monotonic() + self._online_timeout
+        query = " ".join(user_input.split()).casefold()
+        results = self._cached_lookup(
+            "location",
+            self._location_cache,
+            query,
+            lambda: self._hedged(
+                self._location_providers,
+                lambda provider, timeout: provider.locate(
+                    self._fetch_json, query, self.ONLINE_RESULTS, timeout
+                ),
+                deadline,
+            ),
+            deadline,
+        )
+        if not results:
+            return suggestions
 
         self.dbg(results)
         count = 0
         for result in results:
-            if count >= 5:
+            if (
+                count >= self.ONLINE_RESULTS
+                or self.should_terminate()
+                or time.monotonic() >= deadline
+            ):
                 break
             lat = result["lat"]
             lon = result["lon"]
             display_name = result["display_name"]
             name = result["name"]
 
-            if (lat, lon) in self._latlon_cache:
-                self.dbg("using cached results for lat/lon:", (lat, lon))
-                results2 = self._latlon_cache[(lat, lon)]
+            if "timezone" in result:
+                tz = result["timezone"]
             else:
-                req = urllib.request.Request(
-                    "https://api.geotimezone.com/public/timezone?latitude="
-                    + lat
-                    + "&longitude="
-                    + lon
-                )
-                with self._urlopener.open(req) as resp:
-                    if resp.info().get("Content-Encoding") == "gzip":
-                        results2 = json.loads(gzip.decompress(resp.read()).decode())
-                    else:
-                        results2 = json.loads(resp.read().decode())
-                self.dbg("putting results in cache for lat/lon:", (lat, lon))
-                self._latlon_cache[(lat, lon)] = results2
-
-            self.dbg(results2)
-            tz = results2["iana_timezone"]
-            timezone = dateutil.tz.gettz(tz)
+                tz = self._lookup_timezone(lat, lon, deadline)
+            if not tz:
+                continue
+            timezone = self._gettz(tz)
 
             suggestions.append(
                 self.create_item(
@@ -368,7 +1414,7 @@ class Time(kp.Plugin):
                         user_input,
                         name,
                         tz,
-                        datetime.datetime.utcnow()
+                        datetime.datetime.now(tz=datetime.timezone.utc)
                         .astimezone(tz=timezone)
                         .strftime("%z"),
                     ),
@@ -382,8 +1428,474 @@ class Time(kp.Plugin):
             count += 1
         return suggestions
 
+    def _find_timestamps(self, text):
+        """Searches a text for everything that looks like a date or timestamp. Returns a list of ((start, end),
+        datetime) tuples for those parts which could actually be parsed"""
+        found = []
+        for match in TIMESTAMP_SCAN_RE.finditer(text):
+            if self.should_terminate():
+                break
+            parsed = self._tryparse(match.group())
+            if parsed is not None:
+                found.append((match.span(), parsed))
+        self.dbg("found timestamps", found)
+        return found
+
+    def _lookup_timezone(self, lat, lon, deadline):
+        """Determines the name of the timezone at a location. Locations are grouped into grid cells, once a location
+        of a cell got an answer the cell is answered without waiting for a request. The exact location is still
+        requested in the background until the cell is confirmed by GRID_CONFIRMATIONS locations. Cells on a timezone
+        border (different answers) are always requested for the exact location"""
+        precision = self._latlon_precision
+        cell = (round(float(lat), precision), round(float(lon), precision))
+        with self._online_lock:
+            # a location answered before is taken from its own cache, which is exact
+            if (lat, lon) in self._latlon_cache:
+                known = None
+            else:
+                known = self._grid_cache.get(cell)
+            check = (
+                known is not None
+                and known[1] < self.GRID_CONFIRMATIONS
+                and (lat, lon) not in known[2]
+                and (lat, lon) not in self._grid_checks
+            )
+            if check:
+                self._grid_checks.add((lat, lon))
+        self._count("grid", known is not None)
+        if known is not None:
+            self.dbg("using timezone of grid cell", cell, "for lat/lon:", (lat, lon))
+            if check:
+                threading.Thread(
+                    target=self._check_grid_cell,
+                    args=(cell, lat, lon),
+                    name="TimeGridCheck",
+                    daemon=True,
+                ).start()
+            return known[0]
+
+        tz = self._request_timezone(lat, lon, deadline)
+        if tz:
+            self._record_grid_cell(cell, lat, lon, tz)
+        return tz
+
+    def _check_grid_cell(self, cell, lat, lon):
+        """Requests the timezone of a location that was answered from its grid cell and records whether it confirms
+        the cell"""
+        try:
+            tz = self._request_timezone(
+                lat, lon, time.monotonic() + self._online_timeout
+            )
+            if tz:
+                self._record_grid_cell(cell, lat, lon, tz)
+        finally:
+            with self._online_lock:
+                self._grid_checks.discard((lat, lon))
+
+    def _request_timezone(self, lat, lon, deadline):
+        """Requests the name of the timezone at the exact location from the providers"""
+        tz = self._cached_lookup(
+            "latlon",
+            self._latlon_cache,
+            (lat, lon),
+            lambda: self._hedged(
+                self._timezone_providers,
+                lambda provider, timeout: provider.timezone(
+                    self._fetch_json, lat, lon, timeout
+                ),
+                deadline,
+            ),
+            deadline,
+        )
+        self.dbg("timezone for lat/lon", (lat, lon), "is", tz)
+        return tz
+
+    def _record_grid_cell(self, cell, lat, lon, tz):
+        """Records the timezone of a location in its grid cell. A cell becomes a border cell once its locations got
+        different answers"""
+        with self._online_lock:
+            if cell not in self._grid_cache:
+                self._grid_cache[cell] = (tz, 1, {(lat, lon)})
+            elif self._grid_cache[cell] is not None:
+                zone, confirmations, locations = self._grid_cache[cell]
+                if zone != tz:
+                    self.dbg("grid cell", cell, "is on a timezone border")
+                    self._grid_cache[cell] = None
+                elif (lat, lon) not in locations:
+                    locations.add((lat, lon))
+                    self._grid_cache[cell] = (zone, confirmations + 1, locations)
+
+    def _cached_lookup(self, cache_name, cache, key, lookup, deadline):
+        """Returns the result of the lookup, which is cached under the key. Concurrent calls for the same key wait
+        for the running lookup until the deadline instead of starting their own. Empty and failed results are
+        remembered for a short time and return None"""
+        while True:
+            with self._online_lock:
+                if key in cache:
+                    self.dbg("using cached results for:", key)
+                    self._count(cache_name, True)
+                    return cache[key]
+                expiry = self._negative_cache.get((cache_name, key))
+                if expiry is not None and expiry > time.monotonic():
+                    self.dbg("using cached empty result for:", key)
+                    self._count(cache_name, True)
+                    return None
+                event = self._online_requests.get((cache_name, key))
+                if event is None:
+                    event = threading.Event()
+                    self._online_requests[(cache_name, key)] = event
+                    break
+            self.dbg("waiting for running lookup for:", key)
+            if not event.wait(max(deadline - time.monotonic(), 0)):
+                return None
+
+        self._count(cache_name, False)
+        result = None
+        try:
+            result = lookup()
+        finally:
+            with self._online_lock:
+                if result:
+                    self.dbg("putting results in cache for:", key)
+                    cache[key] = result
+                elif time.monotonic() < deadline:
+                    # not when the time ran out, the providers may just not have answered yet
+                    self._negative_cache[(cache_name, key)] = (
+                        time.monotonic() + self.NEGATIVE_CACHE_SECONDS
+                    )
+                del self._online_requests[(cache_name, key)]
+            event.set()
+        return result if result else None
+
+    def _hedged(self, providers, ask, deadline):
+        """Asks the providers one after another until one gives an answer. If a provider has not answered within its
+        usual response time (90th percentile) the next one is asked as well, the first answer wins and the others
+        are ignored"""
+        # imported only here, it takes noticeable time to import and many users never search online
+        import concurrent.futures
+
+        executor = self._online_executor()
+        pending = set()
+        for provider in providers:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if not self._breaker(provider.name).allow():
+                self.dbg("provider cooling down, skipping:", provider.name)
+                continue
+            pending.add(executor.submit(self._ask, provider, ask, time.perf_counter()))
+            done, pending = concurrent.futures.wait(
+                pending,
+                timeout=min(self._hedge_delay(provider.name), remaining),
+                return_when=concurrent.futures.FIRST_COMPLETED,
+            )
+            for future in done:
+                if future.result():
+                    return self._first_answer(future, pending)
+            if pending:
+                self.dbg("provider", provider.name, "is slow, asking the next one")
+
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = concurrent.futures.wait(
+                pending,
+                timeout=remaining,
+                return_when=concurrent.futures.FIRST_COMPLETED,
+            )
+            for future in done:
+                if future.result():
+                    return self._first_answer(future, pending)
+        for future in pending:
+            future.cancel()
+        return None
+
+    def _online_executor(self):
+        """Returns the thread pool running the requests to the providers, which is created on first use"""
+        import concurrent.futures
+
+        with self._online_lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=4, thread_name_prefix="TimeOnline"
+                )
+            return self._executor
+
+    @staticmethod
+    def _first_answer(winner, pending):
+        """Returns the answer of the winning request and cancels those that have not started yet"""
+        for future in pending:
+            future.cancel()
+        return winner.result()
+
+    def _ask(self, provider, ask, submitted):
+        """Asks a provider, records its response time and health. Returns None if it failed. The request gets the
+        whole online_timeout even if less is left of the online search, so a provider doesn't count as failed just
+        because an earlier request used up most of the time"""
+        if self._tracer is not None:
+            # the time the request waited for a free worker thread
+            self._tracer.complete("queue", "http", submitted, provider=provider.name)
+        breaker = self._breaker(provider.name)
+        start = time.monotonic()
+        try:
+            answer = ask(provider, self._online_timeout)
+        except (
+            OSError,
+            ValueError,
+            KeyError,
+            http.client.HTTPException,
+            zlib.error,
+        ) as ex:
+            self.warn("Online request to", provider.name, "failed:", ex)
+            breaker.failure()
+            return None
+        breaker.success()
+        with self._online_lock:
+            if provider.name not in self._latencies:
+                self._latencies[provider.name] = collections.deque(
+                    maxlen=self.HEDGE_SAMPLES
+                )
+            self._latencies[provider.name].append(time.monotonic() - start)
+        return answer
+
+    def _hedge_delay(self, provider):
+        """Returns the 90th percentile of the response times of a provider"""
+        with self._online_lock:
+            latencies = sorted(self._latencies.get(provider, ()))
+        if len(latencies) < self.HEDGE_MIN_SAMPLES:
+            return self.HEDGE_DELAY
+        return latencies[int(round(0.9 * (len(latencies) - 1)))]
+
+    def _breaker(self, provider):
+        """Returns the circuit breaker of a provider"""
+        with self._online_lock:
+            if provider not in self._breakers:
+                self._breakers[provider] = CircuitBreaker(
+                    self.BREAKER_FAILURES, self.BREAKER_COOLDOWN
+                )
+            return self._breakers[provider]
+
+    def _fetch_json(self, url, timeout):
+        """Requests an url and returns the decoded json response"""
+        with self._trace(
+            "GET {}".format(urllib.parse.urlsplit(url).hostname), "http", url=url
+        ):
+            # the pool records the wait for a free connection, the connect and the wait for the response headers
+            with self._http.open(url, timeout) as resp:
+                with self._trace("read", "http"):
+                    return self._read_json(resp)
+
+    def _read_json(self, resp):
+        """Reads a (maybe gzip compressed) json response in chunks, decompressing while reading, and decodes it"""
+        if resp.getheader("Content-Encoding") == "gzip":
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        else:
+            decompressor = None
+        data = bytearray()
+        for chunk in iter(lambda: resp.read(self.READ_CHUNK_SIZE), b""):
+            data += decompressor.decompress(chunk) if decompressor else chunk
+        if decompressor:
+            data += decompressor.flush()
+        return json.loads(data)
+
+    def _phase(self, name):
+        """Returns a context manager measuring a phase of on_suggest (does nothing if stats and tracing are
+        disabled)"""
+        if self._tracer is None:
+            if self._stats is None:
+                return contextlib.nullcontext()
+            return self._stats.phase(name)
+        stack = contextlib.ExitStack()
+        if self._stats is not None:
+            stack.enter_context(self._stats.phase(name))
+        stack.enter_context(self._tracer.span(name, "suggest"))
+        return stack
+
+    def _trace(self, name, category, **args):
+        """Returns a context manager recording a trace event (does nothing if tracing is disabled)"""
+        if self._tracer is None:
+            return contextlib.nullcontext()
+        return self._tracer.span(name, category, **args)
+
+    def _count(self, cache, hit):
+        """Counts a hit or miss of a cache (if stats or tracing are enabled)"""
+        if self._stats is not None:
+            self._stats.count(cache, hit)
+        if self._tracer is not None:
+            self._tracer.instant("cache {}".format(cache), "cache", hit=bool(hit))
+
+    def _profile(self):
+        """Returns a context manager profiling the with statement while a profile capture is running (does nothing
+        otherwise)"""
+        if not self._profile_calls:
+            return contextlib.nullcontext()
+        return self.__profile_call()
+
+    @contextlib.contextmanager
+    def __profile_call(self):
+        """Profiles a single call and adds it to the running profile capture, which is written once enough calls
+        are profiled"""
+        # imported only here, they take noticeable time to import and profiling is rarely used
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            if self._profile_stats is None:
+                self._profile_stats = pstats.Stats(profiler)
+            else:
+                self._profile_stats.add(profiler)
+            self._profile_calls -= 1
+            if self._profile_calls <= 0:
+                self._write_profile()
+
+    def _start_profile(self):
+        """Starts a profile capture of the next calls"""
+        self.info("Profiling the next", self.PROFILE_CALLS, "calls")
+        self._profile_stats = None
+        self._profile_calls = self.PROFILE_CALLS
+
+    def _write_profile(self):
+        """Writes the profile capture to a file in the package cache directory and removes the oldest ones"""
+        stats, self._profile_stats = self._profile_stats, None
+        self._profile_calls = 0
+        if stats is None:
+            return
+        cache_path = self.get_package_cache_path(True)
+        path = os.path.join(
+            cache_path,
+            "profile_{}.pstats".format(
+                datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            ),
+        )
+        try:
+            stats.dump_stats(path)
+            self.info("Profile written to", path)
+            profiles = sorted(
+                name
+                for name in os.listdir(cache_path)
+                if name.startswith("profile_") and name.endswith(".pstats")
+            )
+            for name in profiles[: -self.PROFILE_FILES]:
+                os.remove(os.path.join(cache_path, name))
+        except OSError as ex:
+            self.warn("Writing profile failed:", ex)
+
+    def _write_trace(self):
+        """Writes the trace events to a file in the package cache directory and returns its path, None if writing
+        failed"""
+        path = os.path.join(
+            self.get_package_cache_path(True),
+            "trace_{}.json".format(datetime.datetime.now().strftime("%Y%m%d_%H%M%S")),
+        )
+        try:
+            self._tracer.write(path)
+        except OSError as ex:
+            self.warn("Writing trace failed:", ex)
+            return None
+        self.info("Trace written to", path)
+        return path
+
+    def _gettz(self, name):
+        """Looks up a timezone by its name"""
+        with self._phase("timezone"):
+            return dateutil.tz.gettz(name)
+
+    def _log_slow_input(self, user_input, items_chain, phases):
+        """Appends the input, items_chain and phase durations of a slow on_suggest call to the slow input log in the
+        package cache directory, which keeps only the latest records"""
+        record = {
+            "time": datetime.datetime.now().astimezone().isoformat(),
+            "user_input": user_input,
+            "items_chain": [
+                {
+                    "label": item.label(),
+                    "target": item.target(),
+                    "data_bag": item.data_bag(),
+                }
+                for item in items_chain
+            ],
+            "phases_ms": {name: elapsed * 1000 for name, elapsed in phases.items()},
+        }
+        self.dbg("slow input:", record)
+        path = os.path.join(self.get_package_cache_path(True), self.SLOW_INPUT_LOG)
+        try:
+            with open(path, "a+", encoding="utf-8") as log:
+                log.seek(0)
+                records = log.readlines()[-(self.SLOW_INPUT_LOG_SIZE - 1) :]
+                records.append(json.dumps(record) + "\n")
+                log.seek(0)
+                log.truncate()
+                log.writelines(records)
+        except OSError as ex:
+            self.warn("Writing slow input log failed:", ex)
+
+    def _create_stats_suggestions(self):
+        """Creates catalog items showing the durations of the phases of on_suggest, the cache hit rates and the
+        health of the online providers"""
+        suggestions = []
+        for name, count, p50, p99 in self._stats.percentiles():
+            suggestions.append(
+                self.create_item(
+                    category=kp.ItemCategory.KEYWORD,
+                    label="{}: p50 {:.3f} ms, p99 {:.3f} ms".format(name, p50, p99),
+                    short_desc="Duration of phase '{}' over the last {} calls {}".format(
+                        name, count, self.COPY_TO_CB
+                    ),
+                    target="stats_phase_{}".format(name),
+                    args_hint=kp.ItemArgsHint.FORBIDDEN,
+                    hit_hint=kp.ItemHitHint.IGNORE,
+                )
+            )
+        for cache, hits, lookups in self._stats.hit_rates():
+            suggestions.append(
+                self.create_item(
+                    category=kp.ItemCategory.KEYWORD,
+                    label="{} cache: {:.0%} hits".format(cache, hits / lookups),
+                    short_desc="{} of {} lookups in cache '{}' were hits {}".format(
+                        hits, lookups, cache, self.COPY_TO_CB
+                    ),
+                    target="stats_cache_{}".format(cache),
+                    args_hint=kp.ItemArgsHint.FORBIDDEN,
+                    hit_hint=kp.ItemHitHint.IGNORE,
+                )
+            )
+        with self._online_lock:
+            breakers = sorted(self._breakers.items())
+        for provider, breaker in breakers:
+            suggestions.append(
+                self.create_item(
+                    category=kp.ItemCategory.KEYWORD,
+                    label="{}: {}".format(provider, breaker.state()),
+                    short_desc="{} successful and {} failed requests, {} failed in a row {}".format(
+                        breaker.successes,
+                        breaker.failures,
+                        breaker.failures_in_row,
+                        self.COPY_TO_CB,
+                    ),
+                    target="stats_provider_{}".format(provider),
+                    args_hint=kp.ItemArgsHint.FORBIDDEN,
+                    hit_hint=kp.ItemHitHint.IGNORE,
+                )
+            )
+        return suggestions
+
     def _tryparse(self, in_str):
         """Tries to parse a string into a datetime object"""
+        # Maybe its ISO 8601, datetime parses that a lot faster than dateutil
+        if ISO_EXTENDED_RE.match(in_str):
+            try:
+                if in_str.endswith("Z"):
+                    return datetime.datetime.fromisoformat(in_str[:-1] + "+00:00")
+                return datetime.datetime.fromisoformat(in_str)
+            except ValueError as ex:
+                self.dbg("Parsing failed: ", ex, "\n", traceback.format_exc())
+
         # Maybe its a timestamp
         if re.match(r"^\d+$", in_str):
             try:
@@ -417,5 +1929,14 @@ class Time(kp.Plugin):
 
     def on_execute(self, item, action):
         """Copies the item label to the clipboard"""
-        self.dbg("on_execute:", item.target())
-        kpu.set_clipboard(item.label())
+        with self._profile():
+            self.dbg("on_execute:", item.target())
+            if item.target() == "trace_write" and self._tracer is not None:
+                path = self._write_trace()
+                if path is not None:
+                    kpu.set_clipboard(path)
+                return
+            if item.target() == "profile_start":
+                self._start_profile()
+                return
+            kpu.set_clipboard(item.label())
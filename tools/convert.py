@@ -0,0 +1,125 @@
+"""Converts the timestamps in logs to another timezone, with the same parsing as the Time plugin
+
+Streams the files (or stdin) line by line, replaces every date or timestamp found in a line with the time in the
+target timezone and writes the result to stdout. Progress and throughput are reported on stderr.
+
+    python -m tools.convert --zone Europe/Berlin --format "%Y-%m-%d %H:%M:%S" app.log > app.berlin.log
+    tail -f app.log | python -m tools.convert --zone UTC
+"""
+
+import argparse
+import locale
+import os
+import sys
+import time
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests"),
+)
+
+import plugin  # noqa: E402
+
+# lines longer than this are processed in parts, so a file without line breaks doesn't end up in memory at once
+LINE_LIMIT = 1024 * 1024
+PROGRESS_SECONDS = 2
+
+
+def convert_line(time_plugin, line, timezone, frmt):
+    """Returns the line with every timestamp found in it converted to the timezone, and the number of timestamps"""
+    found = time_plugin._find_timestamps(line)
+    if not found:
+        return line, 0
+    parts = []
+    end = 0
+    for (start, stop), parsed in found:
+        # naive times like epochs are in local time, just like in the plugin
+        converted = parsed.astimezone(timezone)
+        parts.append(line[end:start])
+        parts.append(converted.strftime(frmt) if frmt else converted.isoformat())
+        end = stop
+    parts.append(line[end:])
+    return "".join(parts), len(found)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "files", nargs="*", help="files to convert, stdin if none are given"
+    )
+    parser.add_argument(
+        "--zone", help="timezone to convert to, the local timezone if not given"
+    )
+    parser.add_argument(
+        "--format", help="strftime format of the converted times, ISO 8601 if not given"
+    )
+    parser.add_argument("--locale", help="locale for the format, e.g. de_DE")
+    parser.add_argument(
+        "--encoding", default="utf-8", help="encoding of the files, default utf-8"
+    )
+    parser.add_argument(
+        "--quiet", action="store_true", help="don't report the progress"
+    )
+    args = parser.parse_args()
+
+    time_plugin = plugin.start(online=False)
+    timezone = None
+    if args.zone:
+        timezone = time_plugin._gettz(args.zone)
+        if timezone is None:
+            parser.error("unknown timezone: {}".format(args.zone))
+    if args.locale:
+        locale.setlocale(locale.LC_TIME, args.locale)
+
+    out = open(
+        sys.stdout.fileno(),
+        "w",
+        encoding=args.encoding,
+        errors="replace",
+        newline="",
+        closefd=False,
+    )
+    lines = converted = size = 0
+    start = last_report = time.monotonic()
+    for name in args.files or ["-"]:
+        if name == "-":
+            source = open(
+                sys.stdin.fileno(),
+                encoding=args.encoding,
+                errors="replace",
+                newline="",
+                closefd=False,
+            )
+        else:
+            source = open(name, encoding=args.encoding, errors="replace", newline="")
+        with source:
+            for line in iter(lambda: source.readline(LINE_LIMIT), ""):
+                result, count = convert_line(time_plugin, line, timezone, args.format)
+                out.write(result)
+                lines += 1
+                converted += count
+                size += len(line)
+                now = time.monotonic()
+                if not args.quiet and now - last_report >= PROGRESS_SECONDS:
+                    last_report = now
+                    report(lines, converted, size, now - start)
+    out.flush()
+    if not args.quiet:
+        report(lines, converted, size, time.monotonic() - start)
+
+
+def report(lines, converted, size, elapsed):
+    sys.stderr.write(
+        "{} lines, {} timestamps converted, {:.1f} MB in {:.1f} s ({:.1f} MB/s, {:.0f} lines/s)\n".format(
+            lines,
+            converted,
+            size / 1e6,
+            elapsed,
+            size / 1e6 / max(elapsed, 1e-9),
+            lines / max(elapsed, 1e-9),
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()